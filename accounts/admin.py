@@ -1,7 +1,22 @@
 # accounts/admin.py
-from django.contrib import admin
+import csv
+import itertools
+import os
+import tempfile
+
+from django import forms
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Category, Question, ExamResult
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, FloatField
+from django.db.models.functions import Cast, NullIf
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+
+from . import leaderboard, provisioning, tabular
+from .models import User, Category, Question, ExamResult, ExamSession, QuestionStat
 
 
 class ExamResultInline(admin.StackedInline):
@@ -11,10 +26,17 @@ class ExamResultInline(admin.StackedInline):
     extra = 0
 
 
+class RosterUploadForm(forms.Form):
+    roster = forms.FileField(label="فایل فهرست دانش‌آموزان")
+    create_categories = forms.BooleanField(label="ساخت دسته‌بندی‌های ناموجود", required=False)
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     list_display = ('username', 'category', 'has_taken_exam', 'user_score_200', 'date_joined')
     list_filter = ('has_taken_exam', 'category')
+    # نتیجه آزمون (رابطه یک‌به‌یک معکوس) و دسته‌بندی در همان کوئری فهرست خوانده می‌شوند
+    list_select_related = ('category', 'examresult')
     search_fields = ('username',)
     inlines = [ExamResultInline]
 
@@ -31,9 +53,54 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    change_list_template = 'admin/accounts/user/change_list.html'
+
+    def get_urls(self):
+        urls = [
+            path('provision/', self.admin_site.admin_view(self.provision_view), name='accounts_user_provision'),
+        ]
+        return urls + super().get_urls()
+
+    def provision_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form = RosterUploadForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            roster = form.cleaned_data['roster']
+            suffix = os.path.splitext(roster.name)[1]
+            with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+                for chunk in roster.chunks():
+                    tmp.write(chunk)
+                tmp.flush()
+                try:
+                    report = provisioning.provision(
+                        (row for _, row in tabular.read_rows(tmp.name)),
+                        workers=provisioning.ADMIN_WORKERS,
+                        create_categories=form.cleaned_data['create_categories'],
+                    )
+                except tabular.FormatError as exc:
+                    form.add_error('roster', str(exc))
+                    report = None
+            if report is not None:
+                self.message_user(request, report.summary(), messages.SUCCESS)
+                response = HttpResponse(content_type='text/csv; charset=utf-8')
+                response['Content-Disposition'] = 'attachment; filename="credentials.csv"'
+                writer = csv.writer(response)
+                writer.writerow(provisioning.REPORT_HEADERS)
+                writer.writerows(report.rows)
+                return response
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': "ساخت انبوه دانش‌آموزان",
+            'form': form,
+        }
+        return TemplateResponse(request, 'admin/accounts/user/provision.html', context)
+
     def user_score_200(self, obj):
         return obj.examresult.score_200 if hasattr(obj, 'examresult') else "-"
     user_score_200.short_description = "نمره (از ۲۰۰)"
+    user_score_200.admin_order_field = 'examresult__score_200'
 
 
 @admin.register(Category)
@@ -41,28 +108,149 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'question_count')
     search_fields = ('name',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(question_total=Count('questions'))
+
     def question_count(self, obj):
-        return obj.questions.count()
+        return obj.question_total
     question_count.short_description = "تعداد سوالات"
+    question_count.admin_order_field = 'question_total'
 
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
-    list_display = ('text_preview', 'category', 'correct_option')
+    list_display = ('text_preview', 'category', 'correct_option', 'attempts', 'p_value', 'discrimination', 'choices')
     list_filter = ('category', 'correct_option')
+    list_select_related = ('category', 'stat')
     search_fields = ('text', 'category__name')
 
+    def get_queryset(self, request):
+        # آمار از شمارنده‌های QuestionStat خوانده می‌شود، نه از پاسخ‌نامه‌ها
+        return super().get_queryset(request).annotate(
+            p_value_order=Cast('stat__correct', FloatField()) / NullIf('stat__attempts', 0),
+        )
+
     def text_preview(self, obj):
         return obj.text[:70] + "..." if len(obj.text) > 70 else obj.text
     text_preview.short_description = "متن سوال"
 
+    def _stat(self, obj):
+        try:
+            return obj.stat
+        except QuestionStat.DoesNotExist:
+            return None
+
+    def attempts(self, obj):
+        stat = self._stat(obj)
+        return stat.attempts if stat else 0
+    attempts.short_description = "تعداد پاسخ‌دهندگان"
+    attempts.admin_order_field = 'stat__attempts'
+
+    def p_value(self, obj):
+        stat = self._stat(obj)
+        return f"{stat.p_value:.2f}" if stat and stat.p_value is not None else "-"
+    p_value.short_description = "ضریب دشواری"
+    p_value.admin_order_field = 'p_value_order'
+
+    def discrimination(self, obj):
+        stat = self._stat(obj)
+        value = stat.discrimination if stat else None
+        return f"{value:.2f}" if value is not None else "-"
+    discrimination.short_description = "ضریب تمیز"
+
+    def choices(self, obj):
+        stat = self._stat(obj)
+        if not stat or not stat.attempts:
+            return "-"
+        counts = (stat.chose_a, stat.chose_b, stat.chose_c, stat.chose_d)
+        return " · ".join(f"{label} {count * 100 // stat.attempts}٪" for label, count in zip(('الف', 'ب', 'ج', 'د'), counts))
+    choices.short_description = "توزیع گزینه‌ها"
+
 
 @admin.register(ExamResult)
 class ExamResultAdmin(admin.ModelAdmin):
-    list_display = ('user', 'score_200', 'percentage', 'submitted_at')
-    list_filter = ('submitted_at',)
-    readonly_fields = ('user', 'correct_answers', 'total_questions', 'percentage', 'score_200', 'submitted_at')
+    list_display = ('user', 'category', 'score_200', 'percentage', 'rank', 'percentile', 'submitted_at')
+    list_filter = ('category', 'submitted_at')
+    list_select_related = ('user', 'category')
+    readonly_fields = ('user', 'category', 'correct_answers', 'total_questions', 'percentage', 'score_200', 'submitted_at')
+    search_fields = ('user__username',)
+    change_list_template = 'admin/accounts/examresult/change_list.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path('export/', self.admin_site.admin_view(self.export_view), name='accounts_examresult_export'),
+        ]
+        return urls + super().get_urls()
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {
+            **(extra_context or {}),
+            'leaderboard_categories': Category.objects.filter(results__isnull=False).distinct().order_by('name'),
+        }
+        return super().changelist_view(request, extra_context)
+
+    def export_view(self, request):
+        """خروجی رتبه‌بندی یک دسته؛ CSV به صورت جریانی و XLSX از فایل موقت ارسال می‌شود."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            category = Category.objects.get(pk=request.GET.get('category'))
+        except (Category.DoesNotExist, ValueError):
+            raise Http404("دسته‌بندی پیدا نشد.")
+        fmt = 'xlsx' if request.GET.get('format') == 'xlsx' else 'csv'
+        rows = leaderboard.ranked_rows(category.pk)
+        filename = f'leaderboard-{category.pk}.{fmt}'
+
+        if fmt == 'xlsx':
+            tmp = tempfile.NamedTemporaryFile(suffix='.xlsx')
+            try:
+                with tabular.RowWriter(tmp.name, leaderboard.HEADERS, 'xlsx') as writer:
+                    for row in rows:
+                        # XLSX تاریخ با منطقه زمانی را نمی‌پذیرد
+                        writer.write(row[:-1] + (timezone.localtime(row[-1]).replace(tzinfo=None),))
+            except tabular.FormatError as exc:
+                tmp.close()
+                self.message_user(request, str(exc), messages.ERROR)
+                return HttpResponseRedirect(reverse('admin:accounts_examresult_changelist'))
+            # فایل موقت با بسته شدن پاسخ بسته و حذف می‌شود
+            tmp.seek(0)
+            return FileResponse(tmp, as_attachment=True, filename=filename)
+
+        class Echo:
+            def write(self, value):
+                return value
+
+        writer = csv.writer(Echo())
+        lines = itertools.chain([writer.writerow(leaderboard.HEADERS)], (writer.writerow(row) for row in rows))
+        response = StreamingHttpResponse(lines, content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        # هیستوگرام همه دسته‌های این صفحه با یک کوئری (برای ستون‌های رتبه و صدک)
+        leaderboard.distributions(result.category_id for result in changelist.result_list)
+        return changelist
+
+    def rank(self, obj):
+        return leaderboard.standing(obj.category_id, obj.score_200).get('rank', '-')
+    rank.short_description = "رتبه در دسته"
+
+    def percentile(self, obj):
+        return leaderboard.standing(obj.category_id, obj.score_200).get('percentile', '-')
+    percentile.short_description = "صدک"
+
+
+@admin.register(ExamSession)
+class ExamSessionAdmin(admin.ModelAdmin):
+    list_display = ('user', 'category', 'started_at', 'deadline', 'checkpoints', 'checkpointed_at', 'sealed_at')
+    list_filter = ('category', 'sealed_at')
+    list_select_related = ('user', 'category')
     search_fields = ('user__username',)
+    readonly_fields = ('user', 'category', 'started_at', 'answers', 'checkpoints', 'checkpointed_at', 'sealed_at')
 
     def has_add_permission(self, request):
-        return False
\ No newline at end of file
+        return False
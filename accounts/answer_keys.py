@@ -0,0 +1,69 @@
+"""
+کلید پاسخ فشرده هر دسته‌بندی آزمون برای تصحیح بدون خواندن متن سوالات.
+
+برای هر دسته یک جفت (شناسه سوالات به ترتیب id، bytes ایندکس گزینه صحیح) در کش نگه
+داشته می‌شود. با ذخیره یا حذف سوال، کلید دسته‌های مربوط با سیگنال و بعد از commit پاک می‌شود.
+"""
+import hashlib
+from array import array
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from .models import Question
+
+
+OPTION_INDEX = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
+TIMEOUT = None
+UNANSWERED = 0xFF
+
+Grading = namedtuple('Grading', 'ids indexes packed correct answered total')
+
+
+def _key(category_id):
+    return f'answer_key:{category_id}'
+
+
+def get(category_id):
+    """(question_ids, indexes) دسته؛ در صورت نبود در کش با یک کوئری سبک ساخته می‌شود."""
+    key = _key(category_id)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        rows = Question.objects.filter(category_id=category_id).order_by('id').values_list('id', 'correct_option')
+        ids, options = zip(*rows) if rows else ((), ())
+        answer_key = (ids, bytes(OPTION_INDEX[option] for option in options))
+        cache.set(key, answer_key, TIMEOUT)
+    return answer_key
+
+
+def invalidate(*category_ids):
+    cache.delete_many([_key(category_id) for category_id in category_ids if category_id is not None])
+
+
+def digest(ids):
+    """اثر انگشت کوتاه ترتیب سوالات؛ پاسخ‌های فشرده فقط با کلیدی با همین اثر قابل تفسیرند."""
+    return hashlib.blake2b(array('q', ids).tobytes(), digest_size=8).hexdigest()
+
+
+def pack(ids, answers):
+    """
+    پاسخ‌های {"question_id": index} به صورت یک بایت برای هر سوال به ترتیب کلید؛
+    پاسخ نامعتبر یا داده‌نشده UNANSWERED است.
+    """
+    packed = bytearray(len(ids))
+    for position, question_id in enumerate(ids):
+        try:
+            value = int(answers.get(str(question_id)))
+        except (TypeError, ValueError):
+            value = UNANSWERED
+        packed[position] = value if 0 <= value < len(OPTION_INDEX) else UNANSWERED
+    return bytes(packed)
+
+
+def grade(category_id, answers):
+    """تصحیح پاسخ‌ها در یک گذر روی کلید پاسخ کش‌شده دسته."""
+    ids, indexes = get(category_id)
+    packed = pack(ids, answers)
+    correct = sum(given == index for given, index in zip(packed, indexes))
+    answered = len(packed) - packed.count(UNANSWERED)
+    return Grading(ids, indexes, packed, correct, answered, len(ids))
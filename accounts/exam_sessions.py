@@ -0,0 +1,99 @@
+"""
+جلسه آزمون سمت سرور و ذخیره دوره‌ای پاسخ‌ها.
+
+با باز شدن صفحه آزمون یک ExamSession با مهلت (مدت آزمون دسته) ساخته می‌شود. مرورگر
+هر چند ثانیه فقط پاسخ‌های تغییرکرده را به checkpoint می‌فرستد و هر checkpoint یک
+به‌روزرسانی کوچک روی ردیف همان جلسه است؛ در ارسال نهایی فقط باقی‌مانده تغییرات
+فرستاده و جلسه مهر و موم می‌شود. بعد از مهلت (به‌اضافه EXAM_SUBMIT_GRACE_SECONDS)
+تغییرات جدید پذیرفته نمی‌شوند و نمره بر اساس آخرین پاسخ‌های ذخیره‌شده محاسبه می‌شود.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import answer_keys
+from .models import ExamSession
+
+
+GRACE = timedelta(seconds=getattr(settings, 'EXAM_SUBMIT_GRACE_SECONDS', 30))
+MAX_DIFF = 1000
+
+
+class CheckpointRejected(Exception):
+    pass
+
+
+def start(user):
+    """جلسه فعال کاربر؛ در اولین بازدید صفحه آزمون ساخته می‌شود."""
+    session = ExamSession.objects.filter(user=user).first()
+    if session is None:
+        deadline = timezone.now() + timedelta(minutes=user.category.duration_minutes)
+        session, _ = ExamSession.objects.get_or_create(
+            user=user, defaults={'category_id': user.category_id, 'deadline': deadline}
+        )
+    return session
+
+
+def is_open(session, now=None):
+    return session.sealed_at is None and (now or timezone.now()) <= session.deadline + GRACE
+
+
+def merge(answers, diff, ids):
+    """
+    اعمال تغییرات {"question_id": index یا null} روی پاسخ‌های جلسه؛ شناسه‌های خارج از
+    کلید پاسخ و مقادیر نامعتبر نادیده گرفته می‌شوند. تعداد تغییرات اعمال‌شده برگردانده می‌شود.
+    """
+    if not isinstance(diff, dict) or len(diff) > MAX_DIFF:
+        raise CheckpointRejected("فرمت پاسخ‌ها نامعتبر است.")
+    valid = set(map(str, ids))
+    applied = 0
+    for question_id, value in diff.items():
+        question_id = str(question_id)
+        if question_id not in valid:
+            continue
+        if value is None:
+            applied += answers.pop(question_id, None) is not None
+            continue
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= value < len(answer_keys.OPTION_INDEX):
+            answers[question_id] = value
+            applied += 1
+    return applied
+
+
+def checkpoint(user, diff):
+    """ذخیره تغییرات پاسخ‌ها روی جلسه باز کاربر؛ جلسه به‌روزشده را برمی‌گرداند."""
+    ids, _ = answer_keys.get(user.category_id)
+    with transaction.atomic():
+        session = ExamSession.objects.select_for_update().filter(user=user).first()
+        if session is None or not is_open(session):
+            raise CheckpointRejected("زمان آزمون به پایان رسیده یا آزمون ثبت شده است.")
+        merge(session.answers, diff, ids)
+        session.checkpoints += 1
+        session.checkpointed_at = timezone.now()
+        session.save(update_fields=['answers', 'checkpoints', 'checkpointed_at'])
+    return session
+
+
+def final_answers(user, diff):
+    """
+    پاسخ‌های نهایی برای تصحیح: پاسخ‌های ذخیره‌شده جلسه به‌همراه آخرین تغییرات
+    (فقط اگر مهلت نگذشته باشد). اگر جلسه‌ای وجود نداشته باشد خود diff استفاده می‌شود.
+    """
+    session = ExamSession.objects.filter(user=user).first()
+    if session is None:
+        return None, diff
+    answers = dict(session.answers)
+    if is_open(session):
+        ids, _ = answer_keys.get(user.category_id)
+        merge(answers, diff, ids)
+    return session, answers
+
+
+def seal(session, answers):
+    ExamSession.objects.filter(pk=session.pk).update(answers=answers, sealed_at=timezone.now())
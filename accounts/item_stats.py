@@ -0,0 +1,132 @@
+"""
+ذخیره پاسخ‌نامه‌های فشرده و به‌روزرسانی تدریجی آمار سوالات (write-behind).
+
+پاسخ‌نامه هر ارسال در همان تراکنش ExamResult ذخیره می‌شود. فقط افزایش شمارنده‌های
+QuestionStat در بافر پروسه جمع می‌شود و در هر تخلیه با یک UPDATE مبتنی بر F() برای کل
+دسته سوالات نوشته می‌شود؛ بنابراین ردیف‌های آمار پرتکرار به ازای هر ارسال قفل نمی‌شوند.
+
+در صورت کرش پروسه حداکثر EXAM_STATS_MAX_PENDING ارسال از آمار جا می‌ماند؛ نتیجه و
+پاسخ‌نامه از دست نمی‌روند و آمار را می‌توان با دستور rebuild_item_stats از روی
+پاسخ‌نامه‌ها از نو ساخت.
+"""
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Case, F, When
+
+from . import answer_keys
+from .models import AnswerLog, Question, QuestionStat
+
+
+FLUSH_INTERVAL = getattr(settings, 'EXAM_STATS_FLUSH_INTERVAL', 5)
+MAX_PENDING = getattr(settings, 'EXAM_STATS_MAX_PENDING', 200)
+
+CHOICE_FIELDS = ('chose_a', 'chose_b', 'chose_c', 'chose_d')
+COUNTER_FIELDS = ('attempts', 'correct') + CHOICE_FIELDS + ('score_sum', 'score_square_sum', 'correct_score_sum')
+ATTEMPTS, CORRECT, CHOSE_A, SCORE_SUM, SCORE_SQUARE_SUM, CORRECT_SCORE_SUM = (
+    COUNTER_FIELDS.index(field)
+    for field in ('attempts', 'correct', 'chose_a', 'score_sum', 'score_square_sum', 'correct_score_sum')
+)
+
+_lock = threading.Lock()
+_pending = 0  # تعداد ارسال‌های بافرشده
+_deltas = {}  # question_id -> [مقدار افزایش به ترتیب COUNTER_FIELDS]
+_last_flush = time.monotonic()
+
+
+def accumulate(deltas, grading):
+    """افزودن سهم یک ارسال به شمارنده‌های سوالات."""
+    score = grading.correct
+    for question_id, given, index in zip(grading.ids, grading.packed, grading.indexes):
+        delta = deltas.get(question_id)
+        if delta is None:
+            delta = deltas[question_id] = [0] * len(COUNTER_FIELDS)
+        delta[ATTEMPTS] += 1
+        delta[SCORE_SUM] += score
+        delta[SCORE_SQUARE_SUM] += score * score
+        if given != answer_keys.UNANSWERED:
+            delta[CHOSE_A + given] += 1
+        if given == index:
+            delta[CORRECT] += 1
+            delta[CORRECT_SCORE_SUM] += score
+
+
+def log_answers(result, category_id, grading):
+    """ثبت پاسخ‌نامه یک ارسال در تراکنش جاری (همراه با ExamResult)."""
+    return AnswerLog.objects.create(
+        result=result,
+        category_id=category_id,
+        key_digest=answer_keys.digest(grading.ids),
+        answers=grading.packed,
+    )
+
+
+def record(grading):
+    """افزودن سهم یک ارسال به بافر آمار؛ در صورت رسیدن به حد زمانی یا تعدادی، بافر تخلیه می‌شود."""
+    global _pending
+    with _lock:
+        _pending += 1
+        accumulate(_deltas, grading)
+        due = _pending >= MAX_PENDING or time.monotonic() - _last_flush >= FLUSH_INTERVAL
+    if due:
+        flush()
+
+
+def _swap():
+    global _pending, _deltas, _last_flush
+    with _lock:
+        pending, deltas = _pending, _deltas
+        _pending, _deltas = 0, {}
+        _last_flush = time.monotonic()
+    return pending, deltas
+
+
+def _restore(pending, deltas):
+    global _pending
+    with _lock:
+        _pending += pending
+        for question_id, delta in deltas.items():
+            current = _deltas.setdefault(question_id, [0] * len(COUNTER_FIELDS))
+            for i, amount in enumerate(delta):
+                current[i] += amount
+
+
+def apply_deltas(deltas):
+    """نوشتن شمارنده‌ها: ساخت ردیف‌های آمار جاافتاده و یک UPDATE برای همه سوالات."""
+    question_ids = set(Question.objects.filter(pk__in=list(deltas)).values_list('pk', flat=True))
+    deltas = {question_id: delta for question_id, delta in deltas.items() if question_id in question_ids}
+    if not deltas:
+        return
+    QuestionStat.objects.bulk_create(
+        [QuestionStat(question_id=question_id) for question_id in deltas], ignore_conflicts=True
+    )
+    updates = {
+        field: F(field) + Case(
+            *[When(pk=question_id, then=delta[i]) for question_id, delta in deltas.items() if delta[i]],
+            default=0,
+        )
+        for i, field in enumerate(COUNTER_FIELDS)
+        if any(delta[i] for delta in deltas.values())
+    }
+    QuestionStat.objects.filter(pk__in=list(deltas)).update(**updates)
+
+
+def flush():
+    """تخلیه بافر؛ تعداد ارسال‌هایی که آمارشان نوشته شد را برمی‌گرداند."""
+    pending, deltas = _swap()
+    if not pending:
+        return 0
+    try:
+        with transaction.atomic():
+            apply_deltas(deltas)
+    except DatabaseError:
+        # در صورت قفل بودن دیتابیس، داده‌ها برای تخلیه بعدی نگه داشته می‌شوند
+        _restore(pending, deltas)
+        return 0
+    return pending
+
+
+atexit.register(flush)
@@ -0,0 +1,186 @@
+"""
+رتبه‌بندی نتایج آزمون هر دسته با هیستوگرام نمره‌ها.
+
+نمره‌ها عدد صحیح در بازه ثابت ۰ تا ۲۰۰ هستند؛ برای هر دسته تعداد نتایج هر نمره در
+ScoreBucket نگه داشته می‌شود و با ثبت یا حذف هر نتیجه یک ردیف با F() به‌روز می‌شود.
+آرایه «تعداد نمره‌های بالاتر» از روی هیستوگرام ساخته و در کش نگه داشته می‌شود، پس
+رتبه هر نمره با یک اندیس‌گذاری خوانده می‌شود. رتبه‌ها رقابتی‌اند (نمره‌های برابر رتبه
+برابر دارند).
+
+هر دسته یک شماره نسخه در کش دارد که بعد از هر تغییر هیستوگرام بالا می‌رود و مقدار کش‌شده
+نسخه‌ای را که هنگام ساخت خوانده شده نگه می‌دارد؛ پس آرایه‌ای که خواننده هم‌زمان با یک
+ثبت از داده قدیمی ساخته کهنه شناخته می‌شود و دوباره ساخته می‌شود.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import ExamResult, ScoreBucket
+
+
+MAX_SCORE = 200
+TIMEOUT = None
+HEADERS = ('rank', 'username', 'first_name', 'last_name', 'score_200', 'percentage', 'percentile', 'submitted_at')
+
+
+def _key(category_id):
+    return f'leaderboard:{category_id}'
+
+
+def _version_key(category_id):
+    return f'leaderboard:{category_id}:version'
+
+
+def _clamp(score):
+    return min(max(int(score), 0), MAX_SCORE)
+
+
+def distributions(category_ids):
+    """
+    {category_id: (above، histogram، total)}: above[s] تعداد نتایج با نمره بیشتر از s و
+    histogram[s] تعداد نتایج با نمره s است. دسته‌های بیرون از کش با یک کوئری ساخته می‌شوند.
+    """
+    category_ids = {category_id for category_id in category_ids if category_id is not None}
+    keys = [key for category_id in category_ids for key in (_key(category_id), _version_key(category_id))]
+    found = cache.get_many(keys)
+    result = {}
+    versions = {}
+    missing = []
+    for category_id in category_ids:
+        version = found.get(_version_key(category_id))
+        entry = found.get(_key(category_id))  # (نسخه، (above، histogram، total))
+        if entry is not None and version is not None and entry[0] == version:
+            result[category_id] = entry[1]
+        else:
+            versions[category_id] = version
+            missing.append(category_id)
+    if not missing:
+        return result
+    for category_id in missing:
+        if versions[category_id] is None:
+            # نسخه قبل از خواندن هیستوگرام ثبت می‌شود تا ثبت هم‌زمان آن را بالا ببرد
+            cache.add(_version_key(category_id), time.time_ns(), None)
+            versions[category_id] = cache.get(_version_key(category_id))
+
+    histograms = {category_id: [0] * (MAX_SCORE + 1) for category_id in missing}
+    buckets = ScoreBucket.objects.filter(category_id__in=missing).values_list('category_id', 'score', 'count')
+    for category_id, score, count in buckets:
+        histograms[category_id][_clamp(score)] += count
+    built = {}
+    for category_id, histogram in histograms.items():
+        above = [0] * (MAX_SCORE + 1)
+        running = 0
+        for score in range(MAX_SCORE, -1, -1):
+            above[score] = running
+            running += histogram[score]
+        result[category_id] = value = (tuple(above), tuple(histogram), running)
+        built[_key(category_id)] = (versions[category_id], value)
+    cache.set_many(built, TIMEOUT)
+    return result
+
+
+def distribution(category_id):
+    return distributions([category_id])[category_id]
+
+
+def standing(category_id, score):
+    """{"rank", "rank_total", "percentile"}؛ percentile درصد شرکت‌کنندگان با نمره کمتر است."""
+    if category_id is None:
+        return {}
+    above, histogram, total = distribution(category_id)
+    score = _clamp(score)
+    if not total:
+        return {}
+    below = total - above[score] - histogram[score]
+    return {
+        "rank": above[score] + 1,
+        "rank_total": total,
+        "percentile": round(below * 100 / total, 1),
+    }
+
+
+def record(category_id, score, delta=1):
+    """افزودن (یا با delta منفی، کم کردن) یک نتیجه به هیستوگرام دسته."""
+    if category_id is None:
+        return
+    score = _clamp(score)
+    buckets = ScoreBucket.objects.filter(category_id=category_id, score=score)
+    if delta < 0:
+        # شمارنده منفی نمی‌شود (قید PositiveIntegerField)
+        buckets = buckets.filter(count__gte=-delta)
+    with transaction.atomic():
+        updated = buckets.update(count=F('count') + delta)
+        if not updated and delta > 0:
+            bucket, created = ScoreBucket.objects.get_or_create(
+                category_id=category_id, score=score, defaults={'count': delta}
+            )
+            if not created:
+                ScoreBucket.objects.filter(pk=bucket.pk).update(count=F('count') + delta)
+    invalidate(category_id)
+
+
+def invalidate(*category_ids):
+    for category_id in category_ids:
+        try:
+            cache.incr(_version_key(category_id))
+        except ValueError:
+            # کلید نسخه حذف شده؛ مقدار زمانی با نسخه‌های قدیمی برخورد نمی‌کند
+            cache.set(_version_key(category_id), time.time_ns(), None)
+
+
+def rebuild():
+    """ساخت دوباره همه هیستوگرام‌ها از روی ExamResult؛ تعداد نتایج شمرده‌شده را برمی‌گرداند."""
+    rows = (
+        ExamResult.objects.exclude(category_id=None)
+        .values_list('category_id', 'score_200')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    buckets = {}
+    for category_id, score, total in rows:
+        key = (category_id, _clamp(score))
+        buckets[key] = buckets.get(key, 0) + total
+    with transaction.atomic():
+        category_ids = set(ScoreBucket.objects.values_list('category_id', flat=True).distinct())
+        ScoreBucket.objects.all().delete()
+        ScoreBucket.objects.bulk_create([
+            ScoreBucket(category_id=category_id, score=score, count=count)
+            for (category_id, score), count in buckets.items()
+        ])
+    category_ids.update(category_id for category_id, _ in buckets)
+    invalidate(*category_ids)
+    return sum(buckets.values())
+
+
+def ranked_rows(category_id):
+    """
+    نتایج یک دسته به ترتیب رتبه با ستون‌های HEADERS، به صورت جریانی (بدون ساخت لیست در حافظه).
+
+    برای دقیق بودن خروجی، هیستوگرام از خود نتایج (یک کوئری گروه‌بندی‌شده) ساخته می‌شود.
+    """
+    results = ExamResult.objects.filter(category_id=category_id)
+    histogram = [0] * (MAX_SCORE + 1)
+    for score, total in results.values_list('score_200').annotate(total=Count('id')).order_by():
+        histogram[_clamp(score)] += total
+    total = sum(histogram)
+    above = 0
+    below = {}
+    for score in range(MAX_SCORE, -1, -1):
+        above += histogram[score]
+        below[score] = total - above
+
+    rows = results.order_by('-score_200', 'submitted_at', 'id').values_list(
+        'user__username', 'user__first_name', 'user__last_name', 'score_200', 'percentage', 'submitted_at'
+    )
+    position = rank = 0
+    previous = None
+    for username, first_name, last_name, score, percentage, submitted_at in rows.iterator(chunk_size=2000):
+        position += 1
+        if score != previous:
+            rank, previous = position, score
+        yield (
+            rank, username, first_name, last_name, score, percentage,
+            round(below[_clamp(score)] * 100 / total, 1), submitted_at,
+        )
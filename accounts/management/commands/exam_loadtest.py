@@ -0,0 +1,239 @@
+import json
+import random
+import secrets
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.test import Client
+from django.urls import reverse
+
+from accounts import answer_keys
+from accounts.models import Category, Question, User
+
+
+PREFIX = 'loadtest'
+PASSWORD = 'loadtest-password'
+STAGES = ('login', 'exam', 'submit')
+# ورود موفق به صفحه آزمون ریدایرکت می‌کند؛ ۲۰۰ یعنی فرم با خطا دوباره نمایش داده شده
+EXPECTED_STATUS = {'login': 302, 'exam': 200, 'submit': 200}
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class QueryProbe:
+    """
+    شمارش کوئری‌ها و زمان دستورات نوشتنی یک درخواست روی اتصال thread جاری.
+    زمان نوشتن شامل انتظار برای قفل دیتابیس است (در SQLite قفل کل فایل، در
+    PostgreSQL قفل سطری)؛ خطاهای «database is locked» جداگانه شمرده می‌شوند.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.write_seconds = 0.0
+        self.lock_errors = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        is_write = sql.lstrip().upper().startswith(WRITE_STATEMENTS)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as exc:
+            if 'lock' in str(exc).lower():
+                self.lock_errors += 1
+            raise
+        finally:
+            if is_write:
+                self.write_seconds += time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "شبیه‌سازی ورود، دریافت آزمون و ثبت پاسخ یک گروه کامل دانش‌آموز و گزارش p50/p95/p99، "
+        "تعداد کوئری و زمان انتظار قفل برای هر مرحله. کاربران و سوالات آزمایشی با پیشوند "
+        f"«{PREFIX}-<شناسه اجرا>» ساخته و در پایان فقط همان‌ها حذف می‌شوند."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=2, help="تعداد دسته‌بندی‌های آزمایشی")
+        parser.add_argument('--users', type=int, default=50, help="تعداد دانش‌آموز در هر دسته")
+        parser.add_argument('--questions', type=int, default=40, help="تعداد سوال در هر دسته")
+        parser.add_argument('--concurrency', type=int, default=8, help="تعداد درخواست‌های هم‌زمان")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="مسیر فایل JSON برای ذخیره زمان‌بندی مراحل")
+        parser.add_argument('--compare', help="فایل JSON اجرای قبلی برای مقایسه")
+        parser.add_argument('--keep', action='store_true', help="داده‌های آزمایشی بعد از اجرا حذف نشوند")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['categories'] < 1:
+            raise CommandError("تعداد کاربران و دسته‌ها باید حداقل ۱ باشد.")
+        self.random = random.Random(options['seed'])
+        # شناسه تصادفی اجرا؛ داده‌های واقعی یا اجراهای دیگر هیچ‌وقت با پیشوند این اجرا تطابق ندارند
+        self.prefix = f'{PREFIX}-{secrets.token_hex(4)}'
+        self.user_ids = []
+        self.category_ids = []
+
+        try:
+            users = self.seed(options['categories'], options['users'], options['questions'])
+            self.stdout.write(f"{len(users)} کاربر در {options['categories']} دسته با پیشوند {self.prefix} ساخته شد.")
+            clients = {}
+            # ساعت ۹: همه وارد می‌شوند و صفحه آزمون را باز می‌کنند؛ ساعت ۱۰: همه پاسخ‌ها را می‌فرستند
+            results = {stage: [] for stage in STAGES}
+            wall = {}
+            for stage in STAGES:
+                started = time.perf_counter()
+                results[stage] = self.run_stage(stage, users, clients, options['concurrency'])
+                wall[stage] = time.perf_counter() - started
+        finally:
+            if not options['keep']:
+                self.cleanup()
+            else:
+                self.stdout.write(f"داده‌های آزمایشی با پیشوند {self.prefix} نگه داشته شد.")
+
+        report = {
+            'config': {key: options[key] for key in ('categories', 'users', 'questions', 'concurrency', 'seed')},
+            'database': connection.vendor,
+            'stages': {stage: self.summarize(results[stage], wall[stage]) for stage in STAGES},
+        }
+        self.print_report(report)
+
+        if options['compare']:
+            self.print_comparison(report, json.loads(Path(options['compare']).read_text()))
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"گزارش در {options['output']} ذخیره شد.")
+
+    def cleanup(self):
+        """حذف فقط ردیف‌هایی که همین اجرا ساخته است."""
+        User.objects.filter(id__in=self.user_ids).delete()
+        Category.objects.filter(id__in=self.category_ids).delete()
+        answer_keys.invalidate(*self.category_ids)
+
+    def seed(self, category_count, users_per_category, question_count):
+        # هش رمز عبور یک‌بار ساخته می‌شود؛ ورود هر کاربر هزینه واقعی بررسی رمز را دارد
+        password = make_password(PASSWORD)
+        users = []
+        for c in range(category_count):
+            category = Category.objects.create(name=f'{self.prefix}-{c}')
+            self.category_ids.append(category.pk)
+            Question.objects.bulk_create([
+                Question(
+                    category=category,
+                    text=f"سوال آزمایشی {q} " * 20,
+                    option_a="گزینه الف", option_b="گزینه ب", option_c="گزینه ج", option_d="گزینه د",
+                    correct_option=self.random.choice('ABCD'),
+                )
+                for q in range(question_count)
+            ])
+            User.objects.bulk_create([
+                User(username=f'{self.prefix}-{c}-{u}', password=password, category=category)
+                for u in range(users_per_category)
+            ])
+            # شناسه‌ها دوباره خوانده می‌شوند چون همه بک‌اندها آن‌ها را از bulk_create برنمی‌گردانند
+            created = list(User.objects.filter(category=category, username__startswith=f'{self.prefix}-'))
+            self.user_ids += [user.pk for user in created]
+            users += created
+        return users
+
+    def run_stage(self, stage, users, clients, concurrency):
+        lock = threading.Lock()
+
+        def run(user):
+            with lock:
+                client = clients.setdefault(user.pk, Client())
+            answers = self.answers(user) if stage == 'submit' else None
+            probe = QueryProbe()
+            started = time.perf_counter()
+            status = None
+            try:
+                with connection.execute_wrapper(probe):
+                    status = self.request(stage, client, user, answers)
+            except Exception as exc:
+                status = type(exc).__name__
+            finally:
+                # هر thread اتصال خودش را دارد و باید آن را ببندد
+                connection.close()
+            return {
+                'seconds': time.perf_counter() - started,
+                'queries': probe.queries,
+                'write_seconds': probe.write_seconds,
+                'lock_errors': probe.lock_errors,
+                'ok': status == EXPECTED_STATUS[stage],
+            }
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(run, users))
+
+    def answers(self, user):
+        ids, _ = answer_keys.get(user.category_id)
+        return {str(question_id): self.random.randrange(4) for question_id in ids}
+
+    def request(self, stage, client, user, answers):
+        if stage == 'login':
+            return client.post(reverse('accounts:login'), {'username': user.username, 'password': PASSWORD}).status_code
+        if stage == 'exam':
+            # صفحه آزمون و سپس صفحه اول سوالات، مثل مرورگر
+            status = client.get(reverse('accounts:exam_page')).status_code
+            if status != 200:
+                return status
+            return client.get(reverse('accounts:question_page'), {'page': 1}).status_code
+        return client.post(
+            reverse('accounts:submit_exam'), json.dumps({'answers': answers}), content_type='application/json'
+        ).status_code
+
+    def summarize(self, samples, wall_seconds):
+        latencies = [sample['seconds'] * 1000 for sample in samples]
+        queries = [sample['queries'] for sample in samples]
+        return {
+            'requests': len(samples),
+            'errors': sum(not sample['ok'] for sample in samples),
+            'throughput_rps': round(len(samples) / wall_seconds, 1) if wall_seconds else 0,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(max(latencies, default=0), 2),
+            'queries_mean': round(statistics.fmean(queries), 2) if queries else 0,
+            'queries_max': max(queries, default=0),
+            'write_ms_total': round(sum(sample['write_seconds'] for sample in samples) * 1000, 2),
+            'lock_errors': sum(sample['lock_errors'] for sample in samples),
+        }
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"{'stage':<8}{'reqs':>6}{'err':>5}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+            f"{'q/req':>7}{'q max':>7}{'write ms':>10}{'locked':>8}"
+        )
+        for stage, row in report['stages'].items():
+            self.stdout.write(
+                f"{stage:<8}{row['requests']:>6}{row['errors']:>5}{row['throughput_rps']:>8}"
+                f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+                f"{row['queries_mean']:>7}{row['queries_max']:>7}{row['write_ms_total']:>10}{row['lock_errors']:>8}"
+            )
+
+    def print_comparison(self, report, previous):
+        self.stdout.write("تغییر نسبت به اجرای قبلی:")
+        for stage, row in report['stages'].items():
+            before = previous.get('stages', {}).get(stage)
+            if not before:
+                continue
+            deltas = []
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'queries_mean'):
+                change = row[key] - before[key]
+                percent = f" ({change / before[key] * 100:+.0f}%)" if before[key] else ""
+                deltas.append(f"{key} {change:+.2f}{percent}")
+            line = f"  {stage}: " + ", ".join(deltas)
+            regressed = before['p95_ms'] and row['p95_ms'] > before['p95_ms'] * 1.2
+            self.stdout.write(self.style.WARNING(line) if regressed else line)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts import leaderboard, tabular
+from accounts.models import Category
+
+
+class Command(BaseCommand):
+    help = "خروجی رتبه‌بندی نتایج یک دسته در CSV، JSONL یا XLSX (به ترتیب رتبه و به صورت جریانی)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('category', help="نام دسته‌بندی")
+        parser.add_argument('path', help="مسیر فایل خروجی؛ '-' برای خروجی استاندارد")
+        parser.add_argument('--format', choices=tabular.FORMATS, help="قالب خروجی در صورت نامشخص بودن از پسوند")
+
+    def handle(self, *args, **options):
+        category = Category.objects.filter(name=options['category']).first()
+        if category is None:
+            raise CommandError(f"دسته‌بندی پیدا نشد: {options['category']}")
+
+        fmt = options['format'] or tabular.detect_format(options['path'])
+        try:
+            with tabular.RowWriter(options['path'], leaderboard.HEADERS, fmt) as writer:
+                for row in leaderboard.ranked_rows(category.pk):
+                    # XLSX تاریخ با منطقه زمانی را نمی‌پذیرد
+                    writer.write(row[:-1] + (timezone.localtime(row[-1]).replace(tzinfo=None),))
+        except tabular.FormatError as exc:
+            raise CommandError(str(exc))
+
+        if options['path'] != '-':
+            self.stdout.write(self.style.SUCCESS(f"{writer.count} نتیجه در {options['path']} نوشته شد."))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import tabular
+from accounts.models import Category, Question
+
+
+HEADERS = ('category', 'text', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_option')
+
+
+class Command(BaseCommand):
+    help = "خروجی بانک سوالات در CSV، JSONL یا XLSX (قابل استفاده دوباره با import_questions)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="مسیر فایل خروجی؛ '-' برای خروجی استاندارد")
+        parser.add_argument('--category', action='append', help="فقط این دسته‌بندی (قابل تکرار)")
+        parser.add_argument('--format', choices=tabular.FORMATS, help="قالب خروجی در صورت نامشخص بودن از پسوند")
+
+    def handle(self, *args, **options):
+        questions = Question.objects.order_by('category_id', 'id')
+        if options['category']:
+            names = set(options['category'])
+            missing = names - set(Category.objects.filter(name__in=names).values_list('name', flat=True))
+            if missing:
+                raise CommandError(f"دسته‌بندی پیدا نشد: {', '.join(sorted(missing))}")
+            questions = questions.filter(category__name__in=names)
+
+        fmt = options['format'] or tabular.detect_format(options['path'])
+        try:
+            with tabular.RowWriter(options['path'], HEADERS, fmt) as writer:
+                # ردیف‌ها تکه‌تکه از دیتابیس خوانده و بلافاصله نوشته می‌شوند
+                for row in questions.values_list('category__name', *HEADERS[1:]).iterator(chunk_size=2000):
+                    writer.write(row)
+        except tabular.FormatError as exc:
+            raise CommandError(str(exc))
+
+        if options['path'] != '-':
+            self.stdout.write(self.style.SUCCESS(f"{writer.count} سوال در {options['path']} نوشته شد."))
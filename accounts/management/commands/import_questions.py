@@ -0,0 +1,136 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts import answer_keys, question_bank, tabular
+from accounts.models import Category, Question
+
+
+OPTION_FIELDS = ('option_a', 'option_b', 'option_c', 'option_d')
+# حروف فارسی، لاتین و شماره گزینه همه پذیرفته می‌شوند
+CORRECT_OPTION_ALIASES = {
+    'a': 'A', 'b': 'B', 'c': 'C', 'd': 'D',
+    '1': 'A', '2': 'B', '3': 'C', '4': 'D',
+    'الف': 'A', 'ب': 'B', 'ج': 'C', 'د': 'D',
+}
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "ورود انبوه سوالات از CSV، JSONL یا XLSX با ستون‌های category، text، option_a تا option_d و "
+        "correct_option. سوال‌های تکراری (بر اساس متن نرمال‌شده در همان دسته) رد می‌شوند."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="مسیر فایل .csv، .jsonl یا .xlsx")
+        parser.add_argument('--category', help="نام دسته‌بندی برای همه ردیف‌ها (ستون category نادیده گرفته می‌شود)")
+        parser.add_argument('--format', choices=tabular.FORMATS, help="قالب فایل در صورت نامشخص بودن از پسوند")
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--dry-run', action='store_true', help="فقط اعتبارسنجی، بدون ذخیره")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"فایل {path} پیدا نشد.")
+
+        self.batch_size = options['batch_size']
+        self.dry_run = options['dry_run']
+        self.category_ids = dict(Category.objects.values_list('name', 'id'))
+        # هش سوالات موجود هر دسته فقط وقتی آن دسته در فایل دیده شود بارگذاری می‌شود
+        self.seen = {}
+        self.touched = set()
+        self.buffer = []
+        self.created = self.duplicates = self.invalid = 0
+        started = time.monotonic()
+
+        try:
+            for line_no, row in tabular.read_rows(path, options['format']):
+                question = self.build(line_no, row, options['category'])
+                if question is None:
+                    continue
+                self.buffer.append(question)
+                if len(self.buffer) >= self.batch_size:
+                    self.flush()
+        except tabular.FormatError as exc:
+            raise CommandError(str(exc))
+        self.flush()
+
+        # bulk_create سیگنال post_save نمی‌فرستد
+        answer_keys.invalidate(*self.touched)
+        question_bank.invalidate(*self.touched)
+
+        elapsed = time.monotonic() - started
+        total = self.created + self.duplicates + self.invalid
+        prefix = "[dry-run] " if self.dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{self.created} سوال ثبت شد، {self.duplicates} تکراری و {self.invalid} نامعتبر رد شد — "
+            f"{total} ردیف در {elapsed:.1f} ثانیه ({total / elapsed if elapsed else total:.0f} ردیف/ثانیه)"
+        ))
+
+    def error(self, line_no, message):
+        self.invalid += 1
+        if self.invalid <= MAX_REPORTED_ERRORS:
+            self.stderr.write(f"ردیف {line_no}: {message}")
+
+    def build(self, line_no, row, category_name):
+        category_name = category_name or str(row.get('category') or '').strip()
+        text = str(row.get('text') or '').strip()
+        options = [str(row.get(field) or '').strip() for field in OPTION_FIELDS]
+        correct = CORRECT_OPTION_ALIASES.get(str(row.get('correct_option') or '').strip().lower())
+
+        if not category_name:
+            return self.error(line_no, "دسته‌بندی مشخص نشده است.")
+        if not text:
+            return self.error(line_no, "متن سوال خالی است.")
+        if not all(options):
+            return self.error(line_no, "هر چهار گزینه باید پر باشند.")
+        if any(len(option) > 300 for option in options):
+            return self.error(line_no, "طول گزینه بیشتر از ۳۰۰ نویسه است.")
+        if correct is None:
+            return self.error(line_no, f"گزینه صحیح نامعتبر است: {row.get('correct_option')!r}")
+
+        category_id = self.category(category_name)
+        text_hash = Question.hash_text(text)
+        seen = self.seen_hashes(category_id)
+        if text_hash in seen:
+            self.duplicates += 1
+            return None
+        seen.add(text_hash)
+
+        return Question(
+            category_id=category_id,
+            text=text,
+            correct_option=correct,
+            text_hash=text_hash,
+            **dict(zip(OPTION_FIELDS, options)),
+        )
+
+    def category(self, name):
+        category_id = self.category_ids.get(name)
+        if category_id is None:
+            category_id = -len(self.category_ids) - 1
+            if not self.dry_run:
+                category_id = Category.objects.get_or_create(name=name)[0].pk
+            self.category_ids[name] = category_id
+        return category_id
+
+    def seen_hashes(self, category_id):
+        seen = self.seen.get(category_id)
+        if seen is None:
+            seen = self.seen[category_id] = set(
+                Question.objects.filter(category_id=category_id).values_list('text_hash', flat=True).iterator()
+            )
+        return seen
+
+    def flush(self):
+        if not self.buffer:
+            return
+        batch, self.buffer = self.buffer, []
+        if not self.dry_run:
+            with transaction.atomic():
+                Question.objects.bulk_create(batch)
+            self.touched.update(question.category_id for question in batch)
+        self.created += len(batch)
@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import provisioning, tabular
+
+
+class Command(BaseCommand):
+    help = (
+        "ساخت انبوه حساب دانش‌آموزان از فهرست CSV، JSONL یا XLSX با ستون‌های username، category و "
+        "در صورت تمایل password، first_name و last_name. رمزهای ساخته‌شده در گزارش اعتبارنامه‌ها نوشته می‌شوند."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="مسیر فایل فهرست دانش‌آموزان")
+        parser.add_argument('--output', default='credentials.csv', help="مسیر گزارش اعتبارنامه‌ها (csv/jsonl/xlsx)")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="تعداد پروسه‌های هش رمز")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--create-categories', action='store_true', help="ساخت دسته‌بندی‌های ناموجود")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"فایل {path} پیدا نشد.")
+
+        try:
+            report = provisioning.provision(
+                (row for _, row in tabular.read_rows(path)),
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                create_categories=options['create_categories'],
+            )
+            with tabular.RowWriter(options['output'], provisioning.REPORT_HEADERS) as writer:
+                for row in report.rows:
+                    writer.write(row)
+        except tabular.FormatError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(report.summary()))
+        self.stdout.write(f"گزارش اعتبارنامه‌ها در {options['output']} نوشته شد؛ این فایل شامل رمزهاست و باید محرمانه بماند.")
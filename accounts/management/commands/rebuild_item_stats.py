@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts import answer_keys, item_stats
+from accounts.models import AnswerLog, Category, QuestionStat
+
+
+class Command(BaseCommand):
+    help = (
+        "ساخت دوباره آمار سوالات (ضریب دشواری و تمیز) از روی پاسخ‌نامه‌های ذخیره‌شده. "
+        "پاسخ‌نامه‌هایی که با ترتیب فعلی سوالات دسته ثبت نشده‌اند نادیده گرفته می‌شوند."
+    )
+
+    def handle(self, *args, **options):
+        # ابتدا بافر همین پروسه تخلیه شود
+        item_stats.flush()
+        used = skipped = 0
+        for category_id in Category.objects.values_list('id', flat=True):
+            ids, indexes = answer_keys.get(category_id)
+            digest = answer_keys.digest(ids)
+            logs = AnswerLog.objects.filter(category_id=category_id)
+            skipped += logs.exclude(key_digest=digest).count()
+
+            deltas = {}
+            for packed in logs.filter(key_digest=digest).values_list('answers', flat=True).iterator(chunk_size=2000):
+                packed = bytes(packed)
+                correct = sum(given == index for given, index in zip(packed, indexes))
+                answered = len(packed) - packed.count(answer_keys.UNANSWERED)
+                item_stats.accumulate(deltas, answer_keys.Grading(ids, indexes, packed, correct, answered, len(ids)))
+                used += 1
+
+            with transaction.atomic():
+                QuestionStat.objects.filter(question__category_id=category_id).delete()
+                item_stats.apply_deltas(deltas)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"آمار از {used} پاسخ‌نامه ساخته شد؛ {skipped} پاسخ‌نامه با ترتیب سوالات قدیمی نادیده گرفته شد."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts import leaderboard
+
+
+class Command(BaseCommand):
+    help = "ساخت دوباره هیستوگرام نمره‌های رتبه‌بندی (ScoreBucket) از روی نتایج آزمون."
+
+    def handle(self, *args, **options):
+        total = leaderboard.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"هیستوگرام رتبه‌بندی از {total} نتیجه ساخته شد."))
@@ -0,0 +1,157 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="category",
+            options={
+                "verbose_name": "دسته\u200cبندی",
+                "verbose_name_plural": "دسته\u200cبندی\u200cها",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="examresult",
+            options={
+                "verbose_name": "نتیجه آزمون",
+                "verbose_name_plural": "نتایج آزمون",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="question",
+            options={"verbose_name": "سوال", "verbose_name_plural": "سوالات"},
+        ),
+        migrations.AddField(
+            model_name="examresult",
+            name="answered_questions",
+            field=models.IntegerField(
+                blank=True, null=True, verbose_name="تعداد پاسخ\u200cداده\u200cشده"
+            ),
+        ),
+        migrations.AddField(
+            model_name="examresult",
+            name="idempotency_key",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=64,
+                verbose_name="کلید یکتای ارسال",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="category",
+            name="name",
+            field=models.CharField(
+                max_length=200, unique=True, verbose_name="نام دسته\u200cبندی"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="examresult",
+            name="correct_answers",
+            field=models.IntegerField(verbose_name="پاسخ\u200cهای صحیح"),
+        ),
+        migrations.AlterField(
+            model_name="examresult",
+            name="percentage",
+            field=models.FloatField(verbose_name="درصد"),
+        ),
+        migrations.AlterField(
+            model_name="examresult",
+            name="score_200",
+            field=models.IntegerField(verbose_name="نمره از ۲۰۰"),
+        ),
+        migrations.AlterField(
+            model_name="examresult",
+            name="submitted_at",
+            field=models.DateTimeField(auto_now_add=True, verbose_name="زمان ثبت"),
+        ),
+        migrations.AlterField(
+            model_name="examresult",
+            name="total_questions",
+            field=models.IntegerField(verbose_name="تعداد کل سوالات"),
+        ),
+        migrations.AlterField(
+            model_name="examresult",
+            name="user",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="کاربر",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="question",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="questions",
+                to="accounts.category",
+                verbose_name="دسته\u200cبندی",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="question",
+            name="correct_option",
+            field=models.CharField(
+                choices=[("A", "الف"), ("B", "ب"), ("C", "ج"), ("D", "د")],
+                max_length=1,
+                verbose_name="گزینه صحیح",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="question",
+            name="option_a",
+            field=models.CharField(max_length=300, verbose_name="گزینه الف"),
+        ),
+        migrations.AlterField(
+            model_name="question",
+            name="option_b",
+            field=models.CharField(max_length=300, verbose_name="گزینه ب"),
+        ),
+        migrations.AlterField(
+            model_name="question",
+            name="option_c",
+            field=models.CharField(max_length=300, verbose_name="گزینه ج"),
+        ),
+        migrations.AlterField(
+            model_name="question",
+            name="option_d",
+            field=models.CharField(max_length=300, verbose_name="گزینه د"),
+        ),
+        migrations.AlterField(
+            model_name="question",
+            name="text",
+            field=models.TextField(verbose_name="متن سوال"),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="category",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="accounts.category",
+                verbose_name="دسته\u200cبندی آزمون",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="has_taken_exam",
+            field=models.BooleanField(default=False, verbose_name="آزمون داده شده؟"),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="score",
+            field=models.IntegerField(default=0, verbose_name="نمره از ۲۰۰"),
+        ),
+    ]
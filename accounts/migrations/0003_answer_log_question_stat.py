@@ -0,0 +1,112 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_examresult_submission_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionStat",
+            fields=[
+                (
+                    "question",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stat",
+                        serialize=False,
+                        to="accounts.question",
+                        verbose_name="سوال",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="تعداد شرکت\u200cکنندگان"
+                    ),
+                ),
+                (
+                    "correct",
+                    models.PositiveIntegerField(default=0, verbose_name="پاسخ صحیح"),
+                ),
+                (
+                    "chose_a",
+                    models.PositiveIntegerField(default=0, verbose_name="انتخاب الف"),
+                ),
+                (
+                    "chose_b",
+                    models.PositiveIntegerField(default=0, verbose_name="انتخاب ب"),
+                ),
+                (
+                    "chose_c",
+                    models.PositiveIntegerField(default=0, verbose_name="انتخاب ج"),
+                ),
+                (
+                    "chose_d",
+                    models.PositiveIntegerField(default=0, verbose_name="انتخاب د"),
+                ),
+                ("score_sum", models.BigIntegerField(default=0)),
+                ("score_square_sum", models.BigIntegerField(default=0)),
+                ("correct_score_sum", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "آمار سوال",
+                "verbose_name_plural": "آمار سوالات",
+            },
+        ),
+        migrations.CreateModel(
+            name="AnswerLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key_digest",
+                    models.CharField(
+                        max_length=16, verbose_name="اثر انگشت ترتیب سوالات"
+                    ),
+                ),
+                ("answers", models.BinaryField(verbose_name="پاسخ\u200cها")),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="answer_logs",
+                        to="accounts.category",
+                        verbose_name="دسته\u200cبندی",
+                    ),
+                ),
+                (
+                    "result",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="answer_log",
+                        to="accounts.examresult",
+                        verbose_name="نتیجه آزمون",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "پاسخ\u200cنامه",
+                "verbose_name_plural": "پاسخ\u200cنامه\u200cها",
+                "indexes": [
+                    models.Index(
+                        fields=["category", "key_digest"],
+                        name="answerlog_category_key_idx",
+                    )
+                ],
+            },
+        ),
+    ]
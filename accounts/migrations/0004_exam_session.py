@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_answer_log_question_stat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="duration_minutes",
+            field=models.PositiveIntegerField(
+                default=60, verbose_name="مدت آزمون (دقیقه)"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ExamSession",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="زمان شروع"),
+                ),
+                ("deadline", models.DateTimeField(verbose_name="مهلت پایان")),
+                (
+                    "answers",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        verbose_name="پاسخ\u200cهای ذخیره\u200cشده",
+                    ),
+                ),
+                (
+                    "checkpoints",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="تعداد ذخیره\u200cها"
+                    ),
+                ),
+                (
+                    "checkpointed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="آخرین ذخیره"
+                    ),
+                ),
+                (
+                    "sealed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="زمان ثبت نهایی"
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exam_sessions",
+                        to="accounts.category",
+                        verbose_name="دسته\u200cبندی",
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exam_session",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="کاربر",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "جلسه آزمون",
+                "verbose_name_plural": "جلسات آزمون",
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:57
+
+import hashlib
+import re
+
+from django.db import migrations, models
+
+# کپی core.text.normalize در زمان این مهاجرت؛ تغییرات بعدی تابع روی آن اثر نمی‌گذارد
+_whitespace = re.compile(r"\s+")
+_diacritics = re.compile("[\u064b-\u065f\u0670\u0640]")
+_persian_map = str.maketrans(
+    {
+        "\u064a": "\u06cc",
+        "\u0649": "\u06cc",
+        "\u0643": "\u06a9",
+        "\u0629": "\u0647",
+        "\u0623": "\u0627",
+        "\u0625": "\u0627",
+        "\u200c": " ",
+        "\u200f": None,
+        "\u200e": None,
+        **{chr(0x06F0 + i): str(i) for i in range(10)},
+        **{chr(0x0660 + i): str(i) for i in range(10)},
+    }
+)
+
+
+def normalize(value):
+    value = _diacritics.sub("", (value or "").translate(_persian_map))
+    return _whitespace.sub(" ", value).strip().lower()
+
+
+def fill_text_hash(apps, schema_editor):
+    Question = apps.get_model("accounts", "Question")
+    batch = []
+    for question in Question.objects.only("id", "text").iterator(chunk_size=2000):
+        question.text_hash = hashlib.blake2b(
+            normalize(question.text).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        batch.append(question)
+        if len(batch) >= 2000:
+            Question.objects.bulk_update(batch, ["text_hash"])
+            batch = []
+    Question.objects.bulk_update(batch, ["text_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_exam_session"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="text_hash",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.RunPython(fill_text_hash, migrations.RunPython.noop),
+    ]
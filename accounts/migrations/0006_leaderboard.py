@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_categories_and_buckets(apps, schema_editor):
+    ExamResult = apps.get_model("accounts", "ExamResult")
+    ScoreBucket = apps.get_model("accounts", "ScoreBucket")
+    User = apps.get_model("accounts", "User")
+    ExamResult.objects.update(
+        category_id=models.Subquery(
+            User.objects.filter(pk=models.OuterRef("user_id")).values("category_id")[:1]
+        )
+    )
+    rows = (
+        ExamResult.objects.exclude(category_id=None)
+        .values_list("category_id", "score_200")
+        .annotate(total=models.Count("id"))
+        .order_by()
+    )
+    ScoreBucket.objects.bulk_create(
+        [
+            ScoreBucket(category_id=category_id, score=score, count=total)
+            for category_id, score, total in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_question_text_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="examresult",
+            name="category",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="results",
+                to="accounts.category",
+                verbose_name="دسته\u200cبندی",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ScoreBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.PositiveSmallIntegerField(verbose_name="نمره از ۲۰۰")),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="تعداد")),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="score_buckets",
+                        to="accounts.category",
+                        verbose_name="دسته\u200cبندی",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "توزیع نمره",
+                "verbose_name_plural": "توزیع نمرات",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("category", "score"),
+                        name="scorebucket_category_score_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_categories_and_buckets, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,12 @@
 # accounts/models.py
+import hashlib
+import math
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from core.text import normalize
+
 
 class User(AbstractUser):
     category = models.ForeignKey('Category', on_delete=models.SET_NULL, null=True, blank=True, verbose_name="دسته‌بندی آزمون")
@@ -14,6 +19,7 @@ class User(AbstractUser):
 
 class Category(models.Model):
     name = models.CharField(max_length=200, unique=True, verbose_name="نام دسته‌بندی")
+    duration_minutes = models.PositiveIntegerField(default=60, verbose_name="مدت آزمون (دقیقه)")
 
     class Meta:
         verbose_name = "دسته‌بندی"
@@ -35,6 +41,8 @@ class Question(models.Model):
         choices=[('A', 'الف'), ('B', 'ب'), ('C', 'ج'), ('D', 'د')],
         verbose_name="گزینه صحیح"
     )
+    # هش متن نرمال‌شده برای تشخیص سوال تکراری هنگام ورود انبوه
+    text_hash = models.CharField(max_length=32, db_index=True, editable=False, default='')
 
     class Meta:
         verbose_name = "سوال"
@@ -43,13 +51,29 @@ class Question(models.Model):
     def __str__(self):
         return f"{self.category} - {self.text[:50]}"
 
+    @staticmethod
+    def hash_text(text):
+        return hashlib.blake2b(normalize(text).encode('utf-8'), digest_size=16).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.text_hash = self.hash_text(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'text_hash'}
+        super().save(*args, **kwargs)
+
 
 class ExamResult(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, verbose_name="کاربر")
+    # دسته‌بندی در زمان ثبت آزمون؛ تغییر بعدی دسته کاربر رتبه‌بندی را جابه‌جا نمی‌کند
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='results', verbose_name="دسته‌بندی")
     correct_answers = models.IntegerField(verbose_name="پاسخ‌های صحیح")
     total_questions = models.IntegerField(verbose_name="تعداد کل سوالات")
     percentage = models.FloatField(verbose_name="درصد")
     score_200 = models.IntegerField(verbose_name="نمره از ۲۰۰")
+    # برای نتایج قدیمی که تعداد پاسخ‌ها ثبت نشده خالی است
+    answered_questions = models.IntegerField(null=True, blank=True, verbose_name="تعداد پاسخ‌داده‌شده")
+    idempotency_key = models.CharField(max_length=64, blank=True, default='', editable=False, verbose_name="کلید یکتای ارسال")
     submitted_at = models.DateTimeField(auto_now_add=True, verbose_name="زمان ثبت")
 
     class Meta:
@@ -57,4 +81,112 @@ class ExamResult(models.Model):
         verbose_name_plural = "نتایج آزمون"
 
     def __str__(self):
-        return f"نتیجه {self.user} - نمره: {self.score_200}"
\ No newline at end of file
+        return f"نتیجه {self.user} - نمره: {self.score_200}"
+
+    def as_response(self):
+        """داده‌های نمایش نتیجه برای فرانت‌اند (همان قالب پاسخ SubmitExamView)."""
+        answered = self.total_questions if self.answered_questions is None else self.answered_questions
+        return {
+            "correct": self.correct_answers,
+            "incorrect": answered - self.correct_answers,
+            "unanswered": self.total_questions - answered,
+            "total": self.total_questions,
+            "percentage": self.percentage,
+            "score_200": self.score_200,
+        }
+
+
+class ScoreBucket(models.Model):
+    """هیستوگرام نمره‌های هر دسته (یک ردیف برای هر نمره ۰ تا ۲۰۰) برای محاسبه رتبه بدون شمارش نتایج."""
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='score_buckets', verbose_name="دسته‌بندی")
+    score = models.PositiveSmallIntegerField(verbose_name="نمره از ۲۰۰")
+    count = models.PositiveIntegerField(default=0, verbose_name="تعداد")
+
+    class Meta:
+        verbose_name = "توزیع نمره"
+        verbose_name_plural = "توزیع نمرات"
+        constraints = [models.UniqueConstraint(fields=['category', 'score'], name='scorebucket_category_score_uniq')]
+
+    def __str__(self):
+        return f"{self.category_id}: {self.score} × {self.count}"
+
+
+class AnswerLog(models.Model):
+    """پاسخ‌های یک ارسال: یک بایت برای هر سوال به ترتیب کلید پاسخ دسته (0xFF = بی‌پاسخ)."""
+    result = models.OneToOneField(ExamResult, on_delete=models.CASCADE, related_name='answer_log', verbose_name="نتیجه آزمون")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='answer_logs', verbose_name="دسته‌بندی")
+    key_digest = models.CharField(max_length=16, verbose_name="اثر انگشت ترتیب سوالات")
+    answers = models.BinaryField(verbose_name="پاسخ‌ها")
+
+    class Meta:
+        verbose_name = "پاسخ‌نامه"
+        verbose_name_plural = "پاسخ‌نامه‌ها"
+        indexes = [models.Index(fields=['category', 'key_digest'], name='answerlog_category_key_idx')]
+
+    def __str__(self):
+        return f"پاسخ‌نامه {self.result_id}"
+
+
+class QuestionStat(models.Model):
+    """
+    شمارنده‌های تجمعی هر سوال برای ضریب دشواری و ضریب تمیز؛ با هر ارسال به‌روز می‌شوند
+    تا نمایش آمار نیازی به خواندن پاسخ‌نامه‌ها نداشته باشد.
+    """
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, primary_key=True, related_name='stat', verbose_name="سوال")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="تعداد شرکت‌کنندگان")
+    correct = models.PositiveIntegerField(default=0, verbose_name="پاسخ صحیح")
+    chose_a = models.PositiveIntegerField(default=0, verbose_name="انتخاب الف")
+    chose_b = models.PositiveIntegerField(default=0, verbose_name="انتخاب ب")
+    chose_c = models.PositiveIntegerField(default=0, verbose_name="انتخاب ج")
+    chose_d = models.PositiveIntegerField(default=0, verbose_name="انتخاب د")
+    # مجموع نمره خام (تعداد پاسخ صحیح کل آزمون) شرکت‌کنندگان، برای همبستگی دو رشته‌ای نقطه‌ای
+    score_sum = models.BigIntegerField(default=0)
+    score_square_sum = models.BigIntegerField(default=0)
+    correct_score_sum = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "آمار سوال"
+        verbose_name_plural = "آمار سوالات"
+
+    def __str__(self):
+        return f"آمار {self.question_id}"
+
+    @property
+    def p_value(self):
+        """ضریب دشواری: نسبت پاسخ‌های صحیح."""
+        return self.correct / self.attempts if self.attempts else None
+
+    @property
+    def discrimination(self):
+        """ضریب تمیز (همبستگی دو رشته‌ای نقطه‌ای پاسخ صحیح این سوال با نمره کل)."""
+        n, k = self.attempts, self.correct
+        if not 0 < k < n:
+            return None
+        mean = self.score_sum / n
+        variance = self.score_square_sum / n - mean * mean
+        if variance <= 0:
+            return None
+        mean_correct = self.correct_score_sum / k
+        mean_wrong = (self.score_sum - self.correct_score_sum) / (n - k)
+        p = k / n
+        return (mean_correct - mean_wrong) / math.sqrt(variance) * math.sqrt(p * (1 - p))
+
+
+class ExamSession(models.Model):
+    """جلسه آزمون هر دانش‌آموز: زمان شروع، مهلت و آخرین پاسخ‌های ذخیره‌شده (checkpoint)."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='exam_session', verbose_name="کاربر")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='exam_sessions', verbose_name="دسته‌بندی")
+    started_at = models.DateTimeField(auto_now_add=True, verbose_name="زمان شروع")
+    deadline = models.DateTimeField(verbose_name="مهلت پایان")
+    # {"question_id": index}
+    answers = models.JSONField(default=dict, blank=True, verbose_name="پاسخ‌های ذخیره‌شده")
+    checkpoints = models.PositiveIntegerField(default=0, verbose_name="تعداد ذخیره‌ها")
+    checkpointed_at = models.DateTimeField(null=True, blank=True, verbose_name="آخرین ذخیره")
+    sealed_at = models.DateTimeField(null=True, blank=True, verbose_name="زمان ثبت نهایی")
+
+    class Meta:
+        verbose_name = "جلسه آزمون"
+        verbose_name_plural = "جلسات آزمون"
+
+    def __str__(self):
+        return f"جلسه آزمون {self.user}"
@@ -0,0 +1,163 @@
+"""
+ساخت انبوه حساب دانش‌آموزان از روی فهرست (roster).
+
+هزینه اصلی، هش PBKDF2 رمزهاست؛ هش‌ها در چند پروسه موازی ساخته می‌شوند (هر پروسه یک
+هسته) و کاربران با bulk_create دسته‌ای ذخیره می‌شوند. برای ردیف‌های بدون رمز، رمز
+تصادفی ساخته می‌شود و همه رمزها در گزارش اعتبارنامه‌ها برگردانده می‌شوند.
+"""
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .models import Category, User
+
+
+# بدون نویسه‌های شبیه به هم (0/O، 1/l/I) تا رمز چاپی راحت خوانده شود
+PASSWORD_ALPHABET = 'abcdefghjkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+PASSWORD_LENGTH = 10
+HASH_CHUNK = 25
+# پنل مدیریت در پروسه وب اجرا می‌شود و نباید همه هسته‌ها را بگیرد
+ADMIN_WORKERS = getattr(settings, 'PROVISION_ADMIN_WORKERS', 2)
+REPORT_HEADERS = ('username', 'password', 'category', 'status')
+
+
+def generate_password(length=PASSWORD_LENGTH):
+    return ''.join(secrets.choice(PASSWORD_ALPHABET) for _ in range(length))
+
+
+def _init_worker(settings_module):
+    # در پلتفرم‌هایی که پروسه‌ها spawn می‌شوند، جنگو باید در هر پروسه راه‌اندازی شود
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _hash_chunk(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def hashing_pool(workers):
+    """پول پروسه‌ها برای هش رمز؛ برای workers=1 هش در همین پروسه انجام می‌شود (None)."""
+    if workers <= 1:
+        return nullcontext()
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),),
+    )
+
+
+def hash_passwords(passwords, pool=None):
+    """هش رمزها با حفظ ترتیب؛ در صورت وجود pool به صورت موازی."""
+    if pool is None or len(passwords) <= HASH_CHUNK:
+        return _hash_chunk(passwords)
+    chunks = [passwords[i:i + HASH_CHUNK] for i in range(0, len(passwords), HASH_CHUNK)]
+    return [hashed for chunk in pool.map(_hash_chunk, chunks) for hashed in chunk]
+
+
+class Report:
+    def __init__(self, workers):
+        self.rows = []
+        self.created = self.skipped = 0
+        self.workers = workers
+        self.hash_seconds = 0.0
+        self.started = time.monotonic()
+
+    def add(self, username, password, category, status):
+        self.rows.append((username, password, category, status))
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def summary(self):
+        rate = self.created / self.hash_seconds if self.hash_seconds else 0
+        return (
+            f"{self.created} حساب ساخته شد، {self.skipped} ردیف رد شد در {self.elapsed:.1f} ثانیه؛ "
+            f"هش رمزها: {rate:.1f} در ثانیه با {self.workers} هسته ({rate / self.workers:.1f} در ثانیه برای هر هسته)."
+        )
+
+
+def provision(rows, workers=None, batch_size=500, create_categories=False):
+    """
+    rows: dictهایی با username، category و در صورت تمایل password، first_name و last_name.
+    خروجی: Report شامل ردیف‌های گزارش اعتبارنامه (REPORT_HEADERS).
+    """
+    workers = workers or os.cpu_count() or 1
+    report = Report(workers)
+    category_ids = dict(Category.objects.values_list('name', 'id'))
+    batch = []
+
+    def flush():
+        if not batch:
+            return
+        names = [row['username'] for row in batch]
+        existing = set(User.objects.filter(username__in=names).values_list('username', flat=True))
+        pending = []
+        for row in batch:
+            if row['username'] in existing:
+                report.skipped += 1
+                report.add(row['username'], '', row['category'], 'exists')
+            else:
+                pending.append(row)
+        batch.clear()
+        if not pending:
+            return
+
+        started = time.monotonic()
+        hashes = hash_passwords([row['password'] for row in pending], pool)
+        report.hash_seconds += time.monotonic() - started
+
+        users = [
+            User(
+                username=row['username'],
+                password=hashed,
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                category_id=category_ids[row['category']],
+            )
+            for row, hashed in zip(pending, hashes)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=batch_size)
+        report.created += len(users)
+        for row in pending:
+            report.add(row['username'], row['password'], row['category'], 'created')
+
+    seen = set()
+    with hashing_pool(workers) as pool:
+        for row in rows:
+            username = str(row.get('username') or '').strip()
+            category = str(row.get('category') or '').strip()
+            status = None
+            if not username:
+                status = 'missing username'
+            elif username in seen:
+                status = 'duplicate in roster'
+            elif category not in category_ids:
+                if create_categories and category:
+                    category_ids[category] = Category.objects.get_or_create(name=category)[0].pk
+                else:
+                    status = 'unknown category'
+            if status:
+                report.skipped += 1
+                report.add(username, '', category, status)
+                continue
+            seen.add(username)
+            batch.append({
+                'username': username,
+                'category': category,
+                'password': str(row.get('password') or '').strip() or generate_password(),
+                'first_name': str(row.get('first_name') or '').strip(),
+                'last_name': str(row.get('last_name') or '').strip(),
+            })
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    return report
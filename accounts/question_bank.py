@@ -0,0 +1,92 @@
+"""
+صفحات آماده سوالات هر دسته برای تحویل تدریجی به صفحه آزمون.
+
+برای هر دسته، سوالات به ترتیب id در صفحه‌های EXAM_QUESTION_PAGE_SIZE تایی تقسیم و هر
+صفحه یک‌بار به JSON تبدیل و با کلید جداگانه خودش در کش نگه داشته می‌شود؛ پاسخ API فقط
+همان رشته آماده است و هر درخواست فقط صفحه خودش را از کش می‌خواند. گزینه صحیح هرگز در
+این داده‌ها قرار نمی‌گیرد.
+
+کلید صفحه‌ها شماره نسخه دسته را دارد؛ سیگنال ذخیره یا حذف سوال بعد از commit نسخه را بالا
+می‌برد و صفحات نسخه قبلی دیگر خوانده نمی‌شوند.
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Question
+
+
+PAGE_SIZE = getattr(settings, 'EXAM_QUESTION_PAGE_SIZE', 20)
+# صفحات نسخه‌های قدیمی بعد از این مدت خودبه‌خود از کش حذف می‌شوند
+TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(category_id):
+    return f'exam_questions:{category_id}:version'
+
+
+def _key(category_id, version, number):
+    # number=0 تعداد صفحات دسته را نگه می‌دارد
+    return f'exam_questions:{category_id}:{version}:{number}'
+
+
+def _version(category_id):
+    version = cache.get(_version_key(category_id))
+    if version is None:
+        cache.add(_version_key(category_id), time.time_ns(), None)
+        version = cache.get(_version_key(category_id))
+    return version
+
+
+def _build(category_id):
+    """[JSON صفحه ۱، JSON صفحه ۲، ...] با یک کوئری."""
+    rows = (
+        Question.objects.filter(category_id=category_id)
+        .order_by('id')
+        .values_list('id', 'text', 'option_a', 'option_b', 'option_c', 'option_d')
+    )
+    questions = [{'id': pk, 'text': text, 'options': [a, b, c, d]} for pk, text, a, b, c, d in rows]
+    pages = [questions[start:start + PAGE_SIZE] for start in range(0, len(questions), PAGE_SIZE)] or [[]]
+    return [
+        json.dumps({
+            'results': page,
+            'page': number,
+            'pages': len(pages),
+            'total': len(questions),
+            'offset': (number - 1) * PAGE_SIZE,
+            'next': number + 1 if number < len(pages) else None,
+        }, ensure_ascii=False)
+        for number, page in enumerate(pages, start=1)
+    ]
+
+
+def page_json(category_id, number):
+    """رشته JSON صفحه number (از ۱)؛ برای صفحه خارج از محدوده None."""
+    if number < 1:
+        return None
+    version = _version(category_id)
+    page_key, count_key = _key(category_id, version, number), _key(category_id, version, 0)
+    found = cache.get_many([page_key, count_key])
+    if page_key in found:
+        return found[page_key]
+    if number > found.get(count_key, number):
+        return None
+
+    pages = _build(category_id)
+    entries = {_key(category_id, version, n): page for n, page in enumerate(pages, start=1)}
+    entries[count_key] = len(pages)
+    cache.set_many(entries, TIMEOUT)
+    return pages[number - 1] if number <= len(pages) else None
+
+
+def invalidate(*category_ids):
+    for category_id in category_ids:
+        if category_id is None:
+            continue
+        try:
+            cache.incr(_version_key(category_id))
+        except ValueError:
+            # کلید نسخه حذف شده؛ مقدار زمانی با نسخه‌های قدیمی برخورد نمی‌کند
+            cache.set(_version_key(category_id), time.time_ns(), None)
@@ -20,7 +20,8 @@ class UserCreateSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'password', 'category')
 
     def create(self, validated_data):
-        user = User.objects.create(
+        # رمز قبل از اولین ذخیره هش می‌شود تا فقط یک INSERT انجام شود
+        user = User(
             username=validated_data['username'],
             category=validated_data['category']
         )
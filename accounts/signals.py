@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import answer_keys, leaderboard, question_bank
+from .models import ExamResult, Question
+
+
+@receiver(pre_save, sender=Question)
+def remember_previous_category(sender, instance, raw=False, **kwargs):
+    # اگر سوال به دسته دیگری منتقل شود، کلید دسته قبلی هم باید پاک شود
+    instance._previous_category_id = None
+    if instance.pk and not raw:
+        instance._previous_category_id = (
+            Question.objects.filter(pk=instance.pk).values_list('category_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_caches(sender, instance, **kwargs):
+    category_ids = (instance.category_id, getattr(instance, '_previous_category_id', None))
+    # بعد از commit؛ وگرنه ارسالی که در همین فاصله تصحیح شود کلید قبلی را بدون انقضا کش می‌کند
+    transaction.on_commit(lambda: answer_keys.invalidate(*category_ids))
+    transaction.on_commit(lambda: question_bank.invalidate(*category_ids))
+
+
+@receiver(pre_save, sender=ExamResult)
+def remember_previous_standing(sender, instance, raw=False, **kwargs):
+    # ویرایش نمره یا دسته در پنل مدیریت باید نتیجه را در هیستوگرام جابه‌جا کند
+    instance._previous_standing = None
+    if instance.pk and not raw:
+        instance._previous_standing = (
+            ExamResult.objects.filter(pk=instance.pk).values_list('category_id', 'score_200').first()
+        )
+
+
+@receiver(post_save, sender=ExamResult)
+def update_leaderboard_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = (instance.category_id, instance.score_200)
+    previous = getattr(instance, '_previous_standing', None)
+    if not created and previous == current:
+        return
+
+    def apply():
+        if previous is not None:
+            leaderboard.record(*previous, delta=-1)
+        leaderboard.record(*current)
+    transaction.on_commit(apply)
+
+
+@receiver(post_delete, sender=ExamResult)
+def update_leaderboard_on_delete(sender, instance, **kwargs):
+    category_id, score = instance.category_id, instance.score_200
+    transaction.on_commit(lambda: leaderboard.record(category_id, score, delta=-1))
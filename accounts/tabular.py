@@ -0,0 +1,113 @@
+"""
+خواندن و نوشتن جریانی فایل‌های جدولی (CSV، JSONL و XLSX) برای دستورات ورود و خروج.
+
+ردیف‌ها یکی‌یکی خوانده و نوشته می‌شوند تا مصرف حافظه به اندازه فایل بستگی نداشته باشد.
+پشتیبانی XLSX به کتابخانه اختیاری openpyxl نیاز دارد.
+"""
+import csv
+import json
+import sys
+from pathlib import Path
+
+
+FORMATS = ('csv', 'jsonl', 'xlsx')
+
+
+class FormatError(Exception):
+    pass
+
+
+def detect_format(path, default='csv'):
+    suffix = Path(path).suffix.lower().lstrip('.')
+    if suffix in FORMATS:
+        return suffix
+    if suffix == 'json':
+        return 'jsonl'
+    return default
+
+
+def _openpyxl():
+    try:
+        import openpyxl
+    except ImportError:
+        raise FormatError("برای فایل‌های XLSX کتابخانه openpyxl لازم است (pip install openpyxl).")
+    return openpyxl
+
+
+def read_rows(path, fmt=None):
+    """ردیف‌ها را به صورت (شماره ردیف، dict) تولید می‌کند."""
+    fmt = fmt or detect_format(path)
+    if fmt == 'xlsx':
+        workbook = _openpyxl().load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+            for line_no, values in enumerate(rows, start=2):
+                if not any(value not in (None, '') for value in values):
+                    continue
+                yield line_no, {
+                    header: '' if value is None else value
+                    for header, value in zip(headers, values) if header
+                }
+        finally:
+            workbook.close()
+        return
+
+    with open(path, encoding='utf-8-sig', newline='') as fh:
+        if fmt == 'csv':
+            for line_no, row in enumerate(csv.DictReader(fh), start=2):
+                yield line_no, row
+            return
+        for line_no, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise FormatError(f"ردیف {line_no}: JSON نامعتبر ({exc})")
+
+
+class RowWriter:
+    """
+    نوشتن ردیف‌ها در CSV/JSONL/XLSX؛ برای XLSX از حالت write_only استفاده می‌شود.
+    مسیر '-' یعنی خروجی استاندارد (فقط CSV و JSONL).
+    """
+
+    def __init__(self, path, headers, fmt=None):
+        self.headers = list(headers)
+        self.fmt = fmt or detect_format(path)
+        self.path = path
+        self.count = 0
+        if self.fmt == 'xlsx':
+            if path == '-':
+                raise FormatError("خروجی XLSX باید در فایل نوشته شود.")
+            self.workbook = _openpyxl().Workbook(write_only=True)
+            self.sheet = self.workbook.create_sheet()
+            self.sheet.append(self.headers)
+            return
+        self.fh = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+        if self.fmt == 'csv':
+            self.writer = csv.writer(self.fh)
+            self.writer.writerow(self.headers)
+
+    def write(self, values):
+        if self.fmt == 'xlsx':
+            self.sheet.append(list(values))
+        elif self.fmt == 'csv':
+            self.writer.writerow(values)
+        else:
+            self.fh.write(json.dumps(dict(zip(self.headers, values)), ensure_ascii=False, default=str) + '\n')
+        self.count += 1
+
+    def close(self):
+        if self.fmt == 'xlsx':
+            self.workbook.save(self.path)
+        elif self.fh is not sys.stdout:
+            self.fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,3 +1,180 @@
+import json
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import answer_keys, leaderboard
+from .models import AnswerLog, Category, ExamResult, ExamSession, Question, QuestionStat, User
+
+
+# سقف کوئری هر صفحه فهرست ادمین، مستقل از تعداد ردیف‌ها
+MAX_CHANGELIST_QUERIES = 12
+
+
+class AdminChangelistQueryTests(TestCase):
+    """صفحات فهرست ادمین نباید به ازای هر ردیف کوئری اضافه بزنند (N+1)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def create_rows(self, count):
+        start = Category.objects.count()
+        for i in range(start, start + count):
+            category = Category.objects.create(name=f"دسته {i}")
+            question = Question.objects.create(
+                category=category, text=f"سوال {i}",
+                option_a="الف", option_b="ب", option_c="ج", option_d="د", correct_option='A',
+            )
+            QuestionStat.objects.create(question=question, attempts=2, correct=1)
+            user = User.objects.create(username=f"student{i}", category=category, has_taken_exam=True, score=100)
+            ExamResult.objects.create(
+                user=user, category=category, correct_answers=1, total_questions=2, answered_questions=2, percentage=50,
+                score_200=100,
+            )
+            ExamSession.objects.create(user=user, category=category, deadline=user.date_joined)
+
+    def changelist_queries(self, model):
+        url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_changelists_have_bounded_queries(self):
+        models = [model for model in admin.site._registry if model._meta.app_label == 'accounts']
+        self.create_rows(2)
+        small = {model: self.changelist_queries(model) for model in models}
+        self.create_rows(20)
+        for model in models:
+            with self.subTest(model=model.__name__):
+                queries = self.changelist_queries(model)
+                self.assertLessEqual(queries, MAX_CHANGELIST_QUERIES)
+                self.assertEqual(queries, small[model], "تعداد کوئری با تعداد ردیف‌ها افزایش یافته است")
+
+    def test_user_changelist_sorts_by_score(self):
+        self.create_rows(3)
+        for score, username in ((150, 'student0'), (190, 'student1'), (120, 'student2')):
+            ExamResult.objects.filter(user__username=username).update(score_200=score)
+        url = reverse('admin:accounts_user_changelist')
+        # شماره ستون در پارامتر o شامل ستون action_checkbox هم می‌شود
+        column = self.client.get(url).context['cl'].list_display.index('user_score_200')
+        response = self.client.get(url, {'o': f'-{column}'})
+        self.assertEqual(response.status_code, 200)
+        usernames = [user.username for user in response.context['cl'].result_list if user.username != 'admin']
+        self.assertEqual(usernames, ['student1', 'student0', 'student2'])
+
+
+class AnswerKeyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_grade_counts_unanswered_and_invalid_answers(self):
+        category = Category.objects.create(name="دسته")
+        questions = [
+            Question.objects.create(
+                category=category, text=f"سوال {i}", option_a="الف", option_b="ب", option_c="ج", option_d="د",
+                correct_option=option,
+            )
+            for i, option in enumerate('ABCD')
+        ]
+        answers = {str(questions[0].pk): 0, str(questions[1].pk): 2, str(questions[2].pk): 9, 'x': 1}
+        grading = answer_keys.grade(category.pk, answers)
+        self.assertEqual((grading.correct, grading.answered, grading.total), (1, 2, 4))
+        self.assertEqual(grading.packed, bytes([0, 2, answer_keys.UNANSWERED, answer_keys.UNANSWERED]))
+
+    def test_editing_correct_option_changes_grading(self):
+        category = Category.objects.create(name="دسته")
+        question = Question.objects.create(
+            category=category, text="سوال", option_a="الف", option_b="ب", option_c="ج", option_d="د",
+            correct_option='A',
+        )
+        answers = {str(question.pk): 0}
+        self.assertEqual(answer_keys.grade(category.pk, answers).correct, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            question.correct_option = 'B'
+            question.save()
+        self.assertEqual(answer_keys.grade(category.pk, answers).correct, 0)
+        self.assertEqual(answer_keys.grade(category.pk, {str(question.pk): 1}).correct, 1)
+
+
+class SubmitExamTests(TestCase):
+    """ثبت پاسخ‌ها فقط یک‌بار انجام می‌شود؛ ارسال دوباره با همان کلید نتیجه ذخیره‌شده را می‌گیرد."""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="دسته")
+        self.questions = [
+            Question.objects.create(
+                category=self.category, text=f"سوال {i}", option_a="الف", option_b="ب", option_c="ج", option_d="د",
+                correct_option='A',
+            )
+            for i in range(4)
+        ]
+        self.user = User.objects.create_user('student', password='password', category=self.category)
+        self.client.force_login(self.user)
+
+    def submit(self, key, correct=3):
+        answers = {str(q.pk): 0 if i < correct else 1 for i, q in enumerate(self.questions)}
+        return self.client.post(
+            reverse('accounts:submit_exam'), json.dumps({'answers': answers}),
+            content_type='application/json', headers={'Idempotency-Key': key},
+        )
+
+    def test_same_key_replays_stored_result(self):
+        first = self.submit('key-1')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()['correct'], 3)
+
+        replay = self.submit('key-1', correct=4)
+        self.assertEqual(replay.status_code, 200)
+        self.assertTrue(replay.json()['duplicate'])
+        self.assertEqual(replay.json()['correct'], 3)
+        self.assertEqual(ExamResult.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(AnswerLog.objects.filter(result__user=self.user).count(), 1)
+
+    def test_different_key_is_rejected(self):
+        self.assertEqual(self.submit('key-1').status_code, 200)
+        self.assertEqual(self.submit('key-2', correct=4).status_code, 403)
+        self.assertEqual(ExamResult.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(AnswerLog.objects.count(), 1)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.score, 150)
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="دسته")
+
+    def add_result(self, name, score):
+        user = User.objects.create(username=name, category=self.category, has_taken_exam=True, score=score)
+        with self.captureOnCommitCallbacks(execute=True):
+            return ExamResult.objects.create(
+                user=user, category=self.category, correct_answers=0, total_questions=1, answered_questions=1,
+                percentage=score / 2, score_200=score,
+            )
+
+    def test_competition_rank_and_percentile(self):
+        for i, score in enumerate((200, 150, 150, 50)):
+            self.add_result(f"student{i}", score)
+        self.assertEqual(
+            leaderboard.standing(self.category.pk, 150), {"rank": 2, "rank_total": 4, "percentile": 25.0}
+        )
+        self.assertEqual(leaderboard.standing(self.category.pk, 200)["percentile"], 75.0)
+        self.assertEqual(leaderboard.standing(self.category.pk, 50)["rank"], 4)
 
-# Create your tests here.
+        # حذف و ویرایش نتیجه هیستوگرام را به‌روز می‌کند
+        result = self.add_result("late", 100)
+        self.assertEqual(leaderboard.standing(self.category.pk, 50)["rank"], 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            result.delete()
+        self.assertEqual(leaderboard.standing(self.category.pk, 50), {"rank": 4, "rank_total": 4, "percentile": 0.0})
@@ -12,5 +12,7 @@ urlpatterns = [
         next_page='accounts:login'  # بعد از خروج بره به لاگین
     ), name='logout'),
     path('', views.ExamView.as_view(), name='exam_page'),
+    path('questions/', views.QuestionPageView.as_view(), name='question_page'),
+    path('checkpoint/', views.CheckpointView.as_view(), name='exam_checkpoint'),
     path('submit/', views.SubmitExamView.as_view(), name='submit_exam'),
 ]
\ No newline at end of file
@@ -3,14 +3,16 @@ from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView as DjangoLoginView
 from django.urls import reverse_lazy
-from django.http import HttpResponseForbidden, JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.shortcuts import redirect
+from django.db import transaction
 import json
 
-from .models import Question, ExamResult
+from . import answer_keys, exam_sessions, item_stats, leaderboard, question_bank
+from .models import ExamResult, User
 
 
 # ویوی لاگین سفارشی
@@ -44,39 +46,80 @@ class ExamView(LoginRequiredMixin, TemplateView):
                 context['percentage'] = user.examresult.percentage
                 context['correct_answers'] = user.examresult.correct_answers
                 context['total_questions'] = user.examresult.total_questions
+                context.update(leaderboard.standing(user.examresult.category_id, user.examresult.score_200))
             return context
 
         # اگر دسته‌بندی نداشته باشه
-        if not user.category:
+        if not user.category_id:
             context['no_category'] = True
             return context
 
-        # ارسال سوالات به تمپلیت
-        questions = Question.objects.filter(category=user.category).order_by('id')
-        context['questions_json'] = [
-            {
-                'id': q.id,
-                'text': q.text,
-                'options': [q.option_a, q.option_b, q.option_c, q.option_d],
-                # ایندکس گزینه صحیح (0=الف، 1=ب، 2=ج، 3=د)
-                'correct_index': {'A': 0, 'B': 1, 'C': 2, 'D': 3}[q.correct_option]
-            } for q in questions
-        ]
-        context['total_questions'] = questions.count()
+        # سوالات به‌صورت صفحه‌به‌صفحه از QuestionPageView دریافت می‌شوند
+        context['total_questions'] = len(answer_keys.get(user.category_id)[0])
+
+        # جلسه آزمون با مهلت؛ پاسخ‌های ذخیره‌شده بعد از بارگذاری دوباره صفحه بازیابی می‌شوند
+        session = exam_sessions.start(user)
+        context['exam_deadline'] = session.deadline.isoformat()
+        context['saved_answers'] = session.answers
         return context
 
 
+# ویوی تحویل صفحه‌ای سوالات (API JSON)
+class QuestionPageView(LoginRequiredMixin, View):
+    def get(self, request):
+        user = request.user
+        if user.is_staff or user.is_superuser:
+            return JsonResponse({"error": "دسترسی برای مدیران مجاز نیست."}, status=403)
+        if user.has_taken_exam:
+            return JsonResponse({"error": "شما قبلاً آزمون را انجام داده‌اید."}, status=403)
+        if not user.category_id:
+            return JsonResponse({"error": "دسته‌بندی آزمون برای شما تعیین نشده است."}, status=400)
+
+        try:
+            number = int(request.GET.get('page', 1))
+        except ValueError:
+            number = 0
+        payload = question_bank.page_json(user.category_id, number)
+        if payload is None:
+            return JsonResponse({"error": "صفحه نامعتبر است."}, status=404)
+        return HttpResponse(payload, content_type='application/json')
+
+
+# ویوی ذخیره دوره‌ای پاسخ‌ها (API JSON)؛ بدنه فقط شامل پاسخ‌های تغییرکرده است
+@method_decorator(csrf_exempt, name='dispatch')
+class CheckpointView(LoginRequiredMixin, View):
+    def post(self, request):
+        user = request.user
+        if user.has_taken_exam or not user.category_id:
+            return JsonResponse({"error": "آزمون فعالی برای شما وجود ندارد."}, status=403)
+
+        try:
+            diff = json.loads(request.body).get('answers', {})
+        except (json.JSONDecodeError, AttributeError):
+            return JsonResponse({"error": "فرمت داده نامعتبر است."}, status=400)
+
+        try:
+            session = exam_sessions.checkpoint(user, diff)
+        except exam_sessions.CheckpointRejected as exc:
+            return JsonResponse({"error": str(exc)}, status=409)
+
+        return JsonResponse({
+            "saved": len(session.answers),
+            "deadline": session.deadline.isoformat(),
+        })
+
+
 # ویوی ثبت پاسخ‌های آزمون (API JSON)
 @method_decorator(csrf_exempt, name='dispatch')
 class SubmitExamView(LoginRequiredMixin, View):
     def post(self, request):
         user = request.user
+        # کلید یکتای هر بار باز شدن صفحه آزمون؛ ارسال دوباره (دابل‌کلیک یا retry) همان نتیجه را می‌گیرد
+        idempotency_key = request.headers.get('Idempotency-Key', '')[:64]
 
-        # جلوگیری از آزمون مجدد
+        # جلوگیری از آزمون مجدد، قبل از هر کار تصحیح
         if user.has_taken_exam:
-            return JsonResponse({
-                "error": "شما قبلاً آزمون را انجام داده‌اید و نمی‌توانید دوباره شرکت کنید."
-            }, status=403)
+            return self.stored_result(user, idempotency_key)
 
         # خواندن داده‌های ارسالی از فرانت (JSON)
         try:
@@ -85,47 +128,57 @@ class SubmitExamView(LoginRequiredMixin, View):
         except json.JSONDecodeError:
             return JsonResponse({"error": "فرمت داده نامعتبر است."}, status=400)
 
-        if not user.category:
+        if not user.category_id:
             return JsonResponse({"error": "دسته‌بندی آزمون برای شما تعیین نشده است."}, status=400)
 
-        questions = Question.objects.filter(category=user.category)
-        total = questions.count()
-        correct = 0
-
-        # محاسبه تعداد پاسخ‌های صحیح
-        correct_map = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
-        for q in questions:
-            user_answer = answers.get(str(q.id))
-            if user_answer is not None:
-                if int(user_answer) == correct_map[q.correct_option]:
-                    correct += 1
+        # پاسخ‌های ذخیره‌شده جلسه به‌علاوه آخرین تغییرات ارسالی (در صورت نگذشتن مهلت)
+        try:
+            session, answers = exam_sessions.final_answers(user, answers)
+        except exam_sessions.CheckpointRejected as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
 
-        answered_count = len(answers)
-        unanswered_count = total - answered_count
-        incorrect_count = answered_count - correct
+        # تصحیح با کلید پاسخ کش‌شده دسته؛ متن سوالات و گزینه‌ها خوانده نمی‌شوند
+        grading = answer_keys.grade(user.category_id, answers)
+        correct, total = grading.correct, grading.total
 
         percentage = round((correct / total) * 100, 1) if total > 0 else 0
         score_200 = int(percentage * 2)
 
-        # ثبت وضعیت و نتیجه
-        user.has_taken_exam = True
-        user.score = score_200
-        user.save()
-
-        ExamResult.objects.create(
-            user=user,
-            correct_answers=correct,
-            total_questions=total,
-            percentage=percentage,
-            score_200=score_200
-        )
+        # UPDATE شرطی آزمون را تصاحب می‌کند؛ از بین درخواست‌های هم‌زمان فقط یکی ردیف را تغییر می‌دهد
+        with transaction.atomic():
+            claimed = User.objects.filter(pk=user.pk, has_taken_exam=False).update(
+                has_taken_exam=True, score=score_200
+            )
+            if claimed:
+                result = ExamResult.objects.create(
+                    user=user,
+                    category_id=user.category_id,
+                    correct_answers=correct,
+                    total_questions=total,
+                    answered_questions=grading.answered,
+                    percentage=percentage,
+                    score_200=score_200,
+                    idempotency_key=idempotency_key,
+                )
+                item_stats.log_answers(result, user.category_id, grading)
+                if session is not None:
+                    exam_sessions.seal(session, answers)
+                # آمار سوالات بعد از commit و به‌صورت دسته‌ای به‌روز می‌شود
+                transaction.on_commit(lambda: item_stats.record(grading))
+
+        if not claimed:
+            return self.stored_result(user, idempotency_key)
+
+        # پاسخ نهایی به فرانت‌اند؛ هیستوگرام رتبه‌بندی در on_commit بالا به‌روز شده است
+        return JsonResponse(self.with_standing(result))
+
+    def stored_result(self, user, idempotency_key):
+        result = ExamResult.objects.filter(user=user).first()
+        if result is None or (idempotency_key and result.idempotency_key and idempotency_key != result.idempotency_key):
+            return JsonResponse({
+                "error": "شما قبلاً آزمون را انجام داده‌اید و نمی‌توانید دوباره شرکت کنید."
+            }, status=403)
+        return JsonResponse({**self.with_standing(result), "duplicate": True})
 
-        # پاسخ نهایی به فرانت‌اند
-        return JsonResponse({
-            "correct": correct,
-            "incorrect": incorrect_count,
-            "unanswered": unanswered_count,
-            "total": total,
-            "percentage": percentage,
-            "score_200": score_200
-        })
\ No newline at end of file
+    def with_standing(self, result):
+        return {**result.as_response(), **leaderboard.standing(result.category_id, result.score_200)}
@@ -0,0 +1,416 @@
+"""
+کش دو لایه پروژه: L1 محدود (LRU) داخل هر پروسه جلوی L2 مشترک (Redis یا جایگزین محلی).
+
+TwoTierCache یک بک‌اند کش جنگو است، پس همه کدهایی که از django.core.cache.cache
+استفاده می‌کنند بدون تغییر از آن بهره می‌برند:
+  - خواندن‌ها ابتدا از L1 و در صورت نبودن از L2 انجام و نتیجه در L1 نگه داشته می‌شود.
+  - نوشتن، حذف و incr روی L2 انجام و L1 همین پروسه هم‌زمان به‌روز می‌شود.
+  - add (قفل‌ها) فقط روی L2 تصمیم می‌گیرد تا بین پروسه‌ها هماهنگ باشد.
+  - ماندگاری هر مقدار در L1 حداکثر L1_TIMEOUT ثانیه است؛ یعنی تغییری که پروسه دیگری در
+    L2 بدهد حداکثر با این تأخیر در این پروسه دیده می‌شود.
+
+روی آن، memoize و دکوریتورهای cached و cache_view کلیدهای نسخه‌دار، باطل‌سازی با تگ،
+انقضای زودهنگام احتمالی (XFetch) و محاسبه تک‌پرواز (فقط یک محاسبه هم‌زمان برای هر
+کلید، هم بین تردها و هم با قفل L2 بین پروسه‌ها) فراهم می‌کنند.
+"""
+import functools
+import hashlib
+import math
+import pickle
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.http import HttpResponse, JsonResponse
+
+
+# ضریب XFetch؛ عدد بزرگ‌تر یعنی محاسبه دوباره زودتر از انقضا
+BETA = 1.0
+LOCK_TIMEOUT = 30
+# پروسه‌ای که قفل را نگرفته و مقدار کهنه ندارد حداکثر این مدت منتظر سازنده می‌ماند
+LOCK_WAIT = 2
+POLL_INTERVAL = 0.05
+_MISSING = object()
+
+
+class _LocalStore:
+    """LRU مشترک بین تردهای یک پروسه (نمونه‌های بک‌اند جنگو برای هر ترد جدا ساخته می‌شوند)."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.data = OrderedDict()  # key -> (زمان انقضا بر اساس monotonic، مقدار pickle‌شده)
+        self.lock = threading.Lock()
+        self.counters = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                return _MISSING
+            if item[0] <= time.monotonic():
+                del self.data[key]
+                return _MISSING
+            self.data.move_to_end(key)
+            pickled = item[1]
+        return pickle.loads(pickled)
+
+    def set(self, key, value, ttl):
+        if ttl <= 0:
+            self.pop(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.data[key] = (time.monotonic() + ttl, pickled)
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def pop(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def count(self, **deltas):
+        with self.lock:
+            for name, delta in deltas.items():
+                self.counters[name] += delta
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+    """
+    LOCATION نام کش L2 در CACHES است. OPTIONS:
+        L1_MAX_ENTRIES: سقف تعداد کلیدهای L1 هر پروسه (پیش‌فرض ۱۰۰۰)
+        L1_TIMEOUT: حداکثر ماندگاری هر کلید در L1 به ثانیه (پیش‌فرض ۵)
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.l2_alias = location
+        self.l1_timeout = options.get('L1_TIMEOUT', 5)
+        with _stores_lock:
+            self.l1 = _stores.get(location)
+            if self.l1 is None:
+                self.l1 = _stores[location] = _LocalStore(options.get('L1_MAX_ENTRIES', 1000))
+
+    @property
+    def l2(self):
+        return caches[self.l2_alias]
+
+    def _l1_ttl(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return self.l1_timeout if timeout is None else min(timeout, self.l1_timeout)
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        value = self.l1.get(local_key)
+        if value is not _MISSING:
+            self.l1.count(l1_hits=1)
+            return value
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.l1.count(misses=1)
+            return default
+        self.l1.count(l2_hits=1)
+        self.l1.set(local_key, value, self.l1_timeout)
+        return value
+
+    def get_many(self, keys, version=None):
+        result = {}
+        missing = {}
+        for key in keys:
+            local_key = self.make_and_validate_key(key, version)
+            value = self.l1.get(local_key)
+            if value is _MISSING:
+                missing[key] = local_key
+            else:
+                result[key] = value
+        found = self.l2.get_many(list(missing), version=version) if missing else {}
+        for key, value in found.items():
+            self.l1.set(missing[key], value, self.l1_timeout)
+        result.update(found)
+        self.l1.count(l1_hits=len(keys) - len(missing), l2_hits=len(found), misses=len(missing) - len(found))
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        self.l2.set(key, value, timeout, version=version)
+        self.l1.set(local_key, value, self._l1_ttl(timeout))
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout, version=version)
+        ttl = self._l1_ttl(timeout)
+        for key, value in data.items():
+            if key not in failed:
+                self.l1.set(self.make_and_validate_key(key, version), value, ttl)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self.l1.set(local_key, value, self._l1_ttl(timeout))
+        else:
+            self.l1.pop(local_key)
+        return added
+
+    def incr(self, key, delta=1, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        try:
+            value = self.l2.incr(key, delta, version=version)
+        except ValueError:
+            self.l1.pop(local_key)
+            raise
+        self.l1.set(local_key, value, self.l1_timeout)
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l1.pop(self.make_and_validate_key(key, version))
+        return self.l2.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.l1.pop(self.make_and_validate_key(key, version))
+        return self.l2.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.l1.pop(self.make_and_validate_key(key, version))
+        self.l2.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        if self.l1.get(self.make_and_validate_key(key, version)) is not _MISSING:
+            return True
+        return self.l2.has_key(key, version=version)
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+
+# --------------------------------------------------
+# memoize: نسخه، تگ، XFetch و تک‌پرواز
+# --------------------------------------------------
+_memo_counters = {'hits': 0, 'misses': 0, 'early_recomputes': 0, 'stale_served': 0}
+_memo_lock = threading.Lock()
+_flights = {}
+
+
+def _count(name):
+    with _memo_lock:
+        _memo_counters[name] += 1
+
+
+def _tag_key(tag):
+    return f'cache_tag:{tag}'
+
+
+def tag_versions(tags):
+    """نسخه فعلی هر تگ؛ تگ‌های بدون نسخه مقدار اولیه می‌گیرند."""
+    keys = [_tag_key(tag) for tag in tags]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return tuple(found[key] for key in keys)
+
+
+def invalidate_tags(*tags):
+    """همه مقادیری که با یکی از این تگ‌ها ذخیره شده‌اند کهنه می‌شوند."""
+    for tag in tags:
+        try:
+            cache.incr(_tag_key(tag))
+        except ValueError:
+            # کلید تگ حذف شده؛ مقدار زمانی با نسخه‌های قدیمی برخورد نمی‌کند
+            cache.set(_tag_key(tag), time.time_ns(), None)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def _single_flight(key, compute):
+    """تردهای هم‌زمان این پروسه برای یک کلید منتظر نتیجه اولین ترد می‌مانند."""
+    with _memo_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+    try:
+        flight.value = compute()
+        return flight.value
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _memo_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def memoize(key, compute, timeout=300, tags=(), version=1, beta=BETA):
+    """
+    مقدار کلید را از کش برمی‌گرداند یا با compute() می‌سازد.
+    version جزء کلید است (تغییر شکل داده با بالا بردن آن)؛ tags با invalidate_tags باطل می‌شوند.
+    """
+    full_key = f'memo:{key}:v{version}'
+    tag_keys = [_tag_key(tag) for tag in tags]
+    found = cache.get_many([full_key, *tag_keys])
+    current = tuple(found.get(tag_key) for tag_key in tag_keys)
+    entry = found.get(full_key)  # (مقدار، نسخه تگ‌ها، مدت محاسبه، زمان انقضا)
+    valid = entry is not None and entry[1] == current
+    if valid:
+        value, _, delta, expires_at = entry
+        # XFetch: هر چه به انقضا نزدیک‌تر و محاسبه گران‌تر باشد، احتمال محاسبه زودتر بیشتر است
+        if expires_at is None or time.time() - delta * beta * math.log(1.0 - random.random()) < expires_at:
+            _count('hits')
+            return value
+        _count('early_recomputes')
+    else:
+        _count('misses')
+
+    def refresh():
+        lock_key = f'{full_key}:lock'
+        if cache.add(lock_key, 1, LOCK_TIMEOUT):
+            try:
+                return _store(full_key, compute, timeout, tags)
+            finally:
+                cache.delete(lock_key)
+        if entry is not None:
+            # پروسه دیگری در حال ساخت است؛ تا آن زمان مقدار قبلی برگردانده می‌شود
+            _count('stale_served')
+            return entry[0]
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            fresh = cache.get(full_key)
+            if fresh is not None:
+                return fresh[0]
+        return _store(full_key, compute, timeout, tags)
+
+    return _single_flight(full_key, refresh)
+
+
+def _store(full_key, compute, timeout, tags):
+    # نسخه تگ‌ها قبل از محاسبه خوانده می‌شود تا باطل‌سازی هم‌زمان نتیجه را کهنه کند
+    versions = tag_versions(tags)
+    started = time.monotonic()
+    value = compute()
+    delta = time.monotonic() - started
+    if timeout is None:
+        cache.set(full_key, (value, versions, delta, None), None)
+    else:
+        # نسخه کهنه تا دو برابر مدت نگه داشته می‌شود تا هنگام ساخت دوباره قابل نمایش باشد
+        cache.set(full_key, (value, versions, delta, time.time() + timeout), timeout * 2)
+    return value
+
+
+def _args_digest(*parts):
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+def cached(timeout=300, tags=(), version=1, key=None):
+    """
+    دکوریتور تابع؛ نتیجه بر اساس آرگومان‌ها (repr) کش می‌شود.
+        @cached(timeout=600, tags=('index:categories',))
+        def category_names(): ...
+    """
+    def decorator(func):
+        prefix = key or f'{func.__module__}.{func.__qualname__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            digest = _args_digest(args, sorted(kwargs.items()))
+            return memoize(f'{prefix}:{digest}', lambda: func(*args, **kwargs), timeout, tags, version)
+        return wrapper
+    return decorator
+
+
+class _Uncacheable(Exception):
+    def __init__(self, response, request):
+        self.response = response
+        self.request = request
+
+
+def cache_view(timeout=300, tags=(), version=1, per_user=False):
+    """
+    دکوریتور ویو برای پاسخ‌های GET/HEAD با وضعیت ۲۰۰ و بدون کوکی؛ کلید آدرس کامل درخواست
+    (و در صورت per_user شناسه کاربر) است. پاسخ‌های دیگر بدون کش برگردانده می‌شوند.
+    """
+    def decorator(view):
+        prefix = f'view:{view.__module__}.{view.__qualname__}'
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            parts = (request.build_absolute_uri(),)
+            if per_user:
+                parts += (request.user.pk,)
+
+            def render():
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render') and callable(response.render):
+                    response = response.render()
+                if response.status_code != 200 or response.streaming or response.cookies:
+                    raise _Uncacheable(response, request)
+                return response.content, dict(response.items())
+
+            try:
+                content, headers = memoize(f'{prefix}:{_args_digest(*parts)}', render, timeout, tags, version)
+            except _Uncacheable as exc:
+                # پاسخ غیرقابل‌کش (مثلاً با کوکی) فقط به همان درخواستی که آن را ساخته داده می‌شود
+                return exc.response if exc.request is request else view(request, *args, **kwargs)
+            response = HttpResponse(content)
+            for header, value in headers.items():
+                response[header] = value
+            return response
+        return wrapper
+    return decorator
+
+
+def stats():
+    """نسبت برخورد L1/L2 (برای همین پروسه) و شمارنده‌های memoize."""
+    with _memo_lock:
+        memo = dict(_memo_counters)
+    lookups = memo['hits'] + memo['misses'] + memo['early_recomputes']
+    result = {'memoize': {**memo, 'hit_ratio': round(memo['hits'] / lookups, 3) if lookups else None}}
+    backend = getattr(cache, 'l1', None)
+    if backend is not None:
+        with backend.lock:
+            tiers = dict(backend.counters)
+            tiers['l1_entries'] = len(backend.data)
+        total = tiers['l1_hits'] + tiers['l2_hits'] + tiers['misses']
+        tiers['l1_hit_ratio'] = round(tiers['l1_hits'] / total, 3) if total else None
+        tiers['hit_ratio'] = round((tiers['l1_hits'] + tiers['l2_hits']) / total, 3) if total else None
+        result['tiers'] = tiers
+    return result
+
+
+@staff_member_required
+def stats_view(request):
+    return JsonResponse(stats())
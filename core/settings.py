@@ -119,6 +119,12 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# فایل‌های آپلودی بر اساس هش محتوا ذخیره می‌شوند تا آپلودهای تکراری یک‌بار ذخیره شوند
+STORAGES = {
+    "default": {"BACKEND": "core.storage.ContentAddressedStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
 # --------------------------------------------------
 # Django Summernote
 # --------------------------------------------------
@@ -145,6 +151,107 @@ SUMMERNOTE_CONFIG = {
     },
 }
 
+# --------------------------------------------------
+# Cache (L1 per process + shared L2)
+# --------------------------------------------------
+# بدون REDIS_URL یک کش حافظه محلی جای L2 را می‌گیرد (توسعه و تست)
+REDIS_URL = os.environ.get("REDIS_URL")
+CACHES = {
+    "default": {
+        "BACKEND": "core.cache.TwoTierCache",
+        "LOCATION": "shared",
+        "OPTIONS": {
+            "L1_MAX_ENTRIES": 2000,
+            # حداکثر تأخیر دیده شدن تغییرات پروسه‌های دیگر (ثانیه)
+            "L1_TIMEOUT": 5,
+        },
+    },
+    "shared": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}
+        if REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "shared", "OPTIONS": {"MAX_ENTRIES": 10000}}
+    ),
+}
+
+# --------------------------------------------------
+# Email
+# --------------------------------------------------
+# پیش‌فرض SMTP است؛ فقط در توسعه (DEBUG) ایمیل‌ها در فایل ذخیره می‌شوند. تست‌ها از locmem استفاده می‌کنند.
+EMAIL_BACKEND = os.environ.get(
+    "EMAIL_BACKEND",
+    "django.core.mail.backends.filebased.EmailBackend" if DEBUG else "django.core.mail.backends.smtp.EmailBackend",
+)
+EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", 25))
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "") == "1"
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "info@emamali-school.ir")
+
+# --------------------------------------------------
+# Contact form intake
+# --------------------------------------------------
+CONTACT_INTAKE_BATCH_SIZE = 50
+CONTACT_INTAKE_BATCH_WINDOW = 2
+CONTACT_INTAKE_MAX_QUEUE = 1000
+# هر IP: حداکثر ۳ پیام در هر پنجره ۳ دقیقه‌ای
+CONTACT_THROTTLE_LIMIT = 3
+CONTACT_THROTTLE_WINDOW = 180
+# گیرندگان اطلاع‌رسانی؛ None یعنی ایمیل همه کارکنان فعال
+CONTACT_NOTIFY_EMAILS = None
+
+# --------------------------------------------------
+# View counters (write-behind)
+# --------------------------------------------------
+# هر پروسه حداکثر این تعداد بازدید یا این مدت (ثانیه) را قبل از نوشتن نگه می‌دارد
+VIEW_COUNT_FLUSH_INTERVAL = 10
+VIEW_COUNT_MAX_PENDING = 500
+
+# --------------------------------------------------
+# Article detail fragment cache
+# --------------------------------------------------
+ARTICLE_DETAIL_CACHE_TIMEOUT = 60 * 60
+
+# --------------------------------------------------
+# About page counters
+# --------------------------------------------------
+# شمارنده‌ها با سیگنال‌ها به‌روز می‌شوند؛ این مدت فقط کش خواندن مجموع ردیف‌هاست
+COUNTERS_CACHE_TIMEOUT = 60
+
+# --------------------------------------------------
+# Home page section cache
+# --------------------------------------------------
+# بخش‌ها با سیگنال‌ها باطل می‌شوند؛ این مدت فقط سقف تازه ماندن بدون سیگنال است
+HOME_SECTION_CACHE_TIMEOUT = 60 * 60
+
+# --------------------------------------------------
+# Image derivatives (WebP/AVIF srcset)
+# --------------------------------------------------
+IMAGE_DERIVATIVE_WIDTHS = (160, 320, 640, 1024)
+IMAGE_DERIVATIVE_WORKERS = 2
+
+# --------------------------------------------------
+# Exam item statistics (write-behind)
+# --------------------------------------------------
+# افزایش آمار سوالات حداکثر این مدت (ثانیه) یا این تعداد ارسال در حافظه می‌ماند؛ پاسخ‌نامه‌ها همان لحظه ذخیره می‌شوند
+EXAM_STATS_FLUSH_INTERVAL = 5
+EXAM_STATS_MAX_PENDING = 200
+
+# --------------------------------------------------
+# Exam question delivery
+# --------------------------------------------------
+EXAM_QUESTION_PAGE_SIZE = 20
+# پاسخ‌هایی که تا این مدت (ثانیه) بعد از مهلت آزمون برسند هنوز پذیرفته می‌شوند
+EXAM_SUBMIT_GRACE_SECONDS = 30
+
+# --------------------------------------------------
+# Student provisioning
+# --------------------------------------------------
+# پروسه‌های هش رمز وقتی فهرست از پنل مدیریت بارگذاری می‌شود (داخل پروسه وب)؛
+# برای فهرست‌های بزرگ از دستور provision_students استفاده کنید
+PROVISION_ADMIN_WORKERS = 2
+
 # --------------------------------------------------
 # Default PK
 # --------------------------------------------------
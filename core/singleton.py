@@ -0,0 +1,88 @@
+"""
+مدل‌های تک‌ردیفی (تنظیمات و محتوای ثابت سایت) با خواندن بدون کوئری.
+
+SingletonModel همیشه با کلید اصلی SINGLETON_PK ذخیره می‌شود و load() نمونه را در
+حافظه پروسه نگه می‌دارد. هر ذخیره یا حذف بعد از commit شماره نسخه مدل را در کش مشترک
+بالا می‌برد؛ بقیه پروسه‌ها با دیدن نسخه جدید ردیف را دوباره از دیتابیس می‌خوانند.
+پس هر خواندن فقط یک get از کش است (که معمولاً از L1 همان پروسه پاسخ داده می‌شود).
+
+نمونه برگشتی بین درخواست‌ها مشترک است و نباید تغییر داده شود؛ برای ویرایش از
+objects.get(pk=...) یا پنل مدیریت استفاده کنید.
+"""
+import threading
+import time
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.db import models, transaction
+
+
+SINGLETON_PK = 1
+
+_instances = {}  # label مدل -> (نسخه، نمونه)
+_lock = threading.Lock()
+
+
+def _version_key(model):
+    return f'singleton:{model._meta.label_lower}:version'
+
+
+class SingletonManager(models.Manager):
+    def load(self):
+        """نمونه تنها ردیف؛ اگر ردیفی ذخیره نشده باشد نمونه ذخیره‌نشده با مقادیر پیش‌فرض."""
+        model = self.model
+        label = model._meta.label_lower
+        version = cache.get(_version_key(model))
+        if version is not None:
+            with _lock:
+                cached = _instances.get(label)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        else:
+            cache.add(_version_key(model), time.time_ns(), None)
+            version = cache.get(_version_key(model))
+
+        instance = self.get_queryset().filter(pk=SINGLETON_PK).first() or model(pk=SINGLETON_PK)
+        with _lock:
+            _instances[label] = (version, instance)
+        return instance
+
+    def invalidate(self):
+        with _lock:
+            _instances.pop(self.model._meta.label_lower, None)
+        try:
+            cache.incr(_version_key(self.model))
+        except ValueError:
+            cache.set(_version_key(self.model), time.time_ns(), None)
+
+
+class SingletonModel(models.Model):
+    objects = SingletonManager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # همیشه همان یک ردیف؛ ذخیره نمونه جدید ردیف موجود را جایگزین می‌کند
+        self.pk = SINGLETON_PK
+        super().save(*args, **kwargs)
+        transaction.on_commit(type(self).objects.invalidate)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(type(self).objects.invalidate)
+        return result
+
+    @classmethod
+    def load(cls):
+        return cls.objects.load()
+
+
+class SingletonModelAdmin(admin.ModelAdmin):
+    """افزودن ردیف دوم و حذف تنها ردیف از پنل مدیریت ممکن نیست."""
+
+    def has_add_permission(self, request):
+        return not self.model.objects.filter(pk=SINGLETON_PK).exists()
+
+    def has_delete_permission(self, request, obj=None):
+        return False
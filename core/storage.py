@@ -0,0 +1,47 @@
+"""
+ذخیره‌سازی مبتنی بر محتوا برای فایل‌های آپلودی.
+
+هر فایل بر اساس هش SHA-256 محتوایش در blobs/<دو حرف اول>/<هش><پسوند> ذخیره
+می‌شود؛ آپلود دوباره همان محتوا (حتی در پوشه یا مدل دیگر) فقط به فایل موجود اشاره
+می‌کند. چون چند رکورد ممکن است به یک فایل اشاره کنند، هیچ کدی نباید فایل اصلی
+را هنگام حذف رکورد پاک کند.
+"""
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+BLOB_DIR = 'blobs'
+
+
+def content_hash(content):
+    """هش SHA-256 یک File جنگو، به‌صورت تکه‌تکه تا فایل‌های بزرگ در حافظه بار نشوند."""
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    # chunks() فایل را از ابتدا می‌خواند؛ برای ذخیره بعدی دوباره به ابتدا برمی‌گردیم
+    content.seek(0)
+    return digest.hexdigest()
+
+
+def blob_name(digest, original_name):
+    ext = os.path.splitext(original_name)[1].lower()
+    return f"{BLOB_DIR}/{digest[:2]}/{digest}{ext}"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        target = blob_name(content_hash(content), name)
+        if self.exists(target):
+            return target
+        return self.save_at(target, content, max_length=max_length)
+
+    def save_at(self, name, content, max_length=None):
+        """ذخیره با همان نام داده‌شده (برای فایل‌های مشتق‌شده مثل thumbnail‌ها)."""
+        return super().save(name, content, max_length=max_length)
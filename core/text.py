@@ -0,0 +1,25 @@
+"""یکسان‌سازی متن فارسی؛ مشترک بین اپ‌ها (جستجو، تشخیص سوالات تکراری)."""
+import re
+
+
+_whitespace = re.compile(r'\s+')
+_diacritics = re.compile('[\u064b-\u065f\u0670\u0640]')  # اعراب و کشیده
+_persian_map = str.maketrans({
+    '\u064a': '\u06cc',  # ي عربی → ی
+    '\u0649': '\u06cc',  # ى → ی
+    '\u0643': '\u06a9',  # ك عربی → ک
+    '\u0629': '\u0647',  # ة → ه
+    '\u0623': '\u0627',  # أ → ا
+    '\u0625': '\u0627',  # إ → ا
+    '\u200c': ' ',        # نیم‌فاصله → فاصله
+    '\u200f': None,
+    '\u200e': None,
+    **{chr(0x06f0 + i): str(i) for i in range(10)},  # ارقام فارسی
+    **{chr(0x0660 + i): str(i) for i in range(10)},  # ارقام عربی
+})
+
+
+def normalize(value):
+    """یکسان‌سازی نویسه‌های عربی/فارسی، نیم‌فاصله و ارقام برای جستجو و مقایسه."""
+    value = _diacritics.sub('', (value or '').translate(_persian_map))
+    return _whitespace.sub(' ', value).strip().lower()
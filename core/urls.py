@@ -21,7 +21,10 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core import cache
+
 urlpatterns = [
+    path('admin/cache-stats/', cache.stats_view, name='cache_stats'),  # نسبت برخورد کش (JSON، فقط کارکنان)
     path('admin/', admin.site.urls),
     path('summernote/', include('django_summernote.urls')),
     path('', include('index.urls')),  # صفحه اصلی سایت
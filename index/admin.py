@@ -1,5 +1,30 @@
+from django import forms
 from django.contrib import admin
-from .models import Category, Author, Article, Course, Announcement, Testimonial, ContactMessage, AboutStat, AboutContent
+from core.singleton import SingletonModelAdmin
+from . import search, tags
+from .models import Category, Author, Tag, Article, Course, Announcement, Testimonial, ContactMessage, AboutStat, AboutContent
+
+
+class ArticleAdminForm(forms.ModelForm):
+    tag_names = forms.CharField(required=False, label="تگ‌ها", help_text="برچسب‌ها را با کاما جدا کنید.")
+
+    class Meta:
+        model = Article
+        exclude = ('tags',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial['tag_names'] = ', '.join(tag.name for tag in self.instance.tags.all())
+
+class FullTextSearchMixin:
+    """جستجوی ادمین از ایندکس تمام‌متن به‌جای LIKE روی بدنه HTML."""
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search.filter_queryset(queryset, search_term), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -10,17 +35,30 @@ class CategoryAdmin(admin.ModelAdmin):
 class AuthorAdmin(admin.ModelAdmin):
     list_display = ('name',)
 
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name',)
+
 @admin.register(Article)
-class ArticleAdmin(admin.ModelAdmin):
+class ArticleAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    form = ArticleAdminForm
     prepopulated_fields = {"slug": ("title",)}
     list_display = ('title', 'category', 'created_at', 'views')
     list_filter = ('category',)
+    list_select_related = ('category',)
     search_fields = ('title', 'content')
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        tags.set_tags(form.instance, form.cleaned_data['tag_names'])
+
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(FullTextSearchMixin, admin.ModelAdmin):
     prepopulated_fields = {"slug": ("title",)}
     list_display = ('title', 'category', 'start_date', 'duration')
+    list_select_related = ('category',)
+    search_fields = ('title', 'description')
 
 @admin.register(Announcement)
 class AnnouncementAdmin(admin.ModelAdmin):
@@ -38,10 +76,10 @@ class ContactMessageAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
 
 @admin.register(AboutStat)
-class AboutStatAdmin(admin.ModelAdmin):
-    list_display = ('years_experience', 'graduates', 'courses', 'teachers')
+class AboutStatAdmin(SingletonModelAdmin):
+    list_display = ('years_experience',)
 
 @admin.register(AboutContent)
-class AboutContentAdmin(admin.ModelAdmin):
+class AboutContentAdmin(SingletonModelAdmin):
     list_display = ('title',)
     fields = ('title', 'text', 'image')
\ No newline at end of file
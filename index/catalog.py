@@ -0,0 +1,153 @@
+import base64
+import json
+from datetime import date, datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+
+from . import images, search
+from .models import Article, Course
+
+
+PAGE_SIZE = 12
+MAX_PAGE_SIZE = 48
+
+# هر مرتب‌سازی: (فیلد، نزولی؟) — همیشه id به‌عنوان کلید دوم برای یکتا بودن مکان‌نما
+ARTICLE_SORTS = {
+    'newest': ('created_at', True),
+    'oldest': ('created_at', False),
+    'popular': ('views', True),
+    'reading-time': ('reading_time', False),
+}
+
+COURSE_SORTS = {
+    'newest': ('start_date', True),
+    'oldest': ('start_date', False),
+    'popular': ('views', True),
+    # مدت زمان دوره متنی است و قابل مرتب‌سازی عددی نیست
+    'reading-time': ('start_date', True),
+}
+
+
+class InvalidCursor(ValueError):
+    """مکان‌نمای صفحه‌بندی خراب یا دستکاری‌شده است."""
+
+
+def encode_cursor(value, pk):
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    raw = json.dumps([value, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return value, int(pk)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def _parse_value(field, value):
+    try:
+        if field == 'created_at':
+            parsed = parse_datetime(value)
+        elif field == 'start_date':
+            parsed = parse_date(value)
+        else:
+            parsed = int(value)
+    except (ValueError, TypeError):
+        parsed = None
+    # مکان‌نمای رمزگشایی‌شده با مقدار نامعتبر هم مثل مکان‌نمای خراب رد می‌شود
+    if parsed is None:
+        raise InvalidCursor(value)
+    return parsed
+
+
+def paginate(queryset, field, descending, cursor=None, limit=PAGE_SIZE):
+    """
+    صفحه‌بندی keyset: هزینه هر صفحه مستقل از شماره صفحه و اندازه جدول است.
+
+    مکان‌نمای خراب یا با مقدار نامعتبر InvalidCursor ایجاد می‌کند.
+    """
+    prefix = '-' if descending else ''
+    queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}id')
+
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        value = _parse_value(field, value)
+        op = 'lt' if descending else 'gt'
+        queryset = queryset.filter(
+            Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'id__{op}': pk})
+        )
+
+    items = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+    return items, next_cursor
+
+
+def _category_fields(obj):
+    return {
+        'category_name': obj.category.name if obj.category else 'نامشخص',
+        'category_slug': obj.category.slug if obj.category else 'other',
+    }
+
+
+def serialize_article(request, a):
+    return {
+        'title': a.title,
+        'slug': a.slug,
+        'excerpt': a.excerpt,
+        'featured_image': request.build_absolute_uri(a.featured_image.url) if a.featured_image else '',
+        'featured_image_srcset': images.srcset(a.featured_image, 'webp') if a.featured_image else '',
+        'created_at': a.created_at.isoformat(),
+        'reading_time': a.reading_time,
+        'views': a.views,
+        **_category_fields(a),
+    }
+
+
+def serialize_course(request, c):
+    return {
+        'title': c.title,
+        'slug': c.slug,
+        'description': c.description,
+        'image': request.build_absolute_uri(c.image.url) if c.image else '',
+        'image_srcset': images.srcset(c.image, 'webp') if c.image else '',
+        'start_date': c.start_date.isoformat(),
+        'duration': c.duration,
+        'features': c.features,
+        'views': c.views,
+        **_category_fields(c),
+    }
+
+
+def _filter_category(qs, category):
+    if not category or category == 'all':
+        return qs
+    if category == 'other':
+        return qs.filter(category__isnull=True)
+    return qs.filter(category__slug=category)
+
+
+def article_queryset(category=None, query=None, tag=None):
+    qs = Article.objects.select_related('category').defer('content')
+    qs = _filter_category(qs, category)
+    if tag:
+        qs = qs.filter(tags__slug=tag)
+    if query:
+        qs = search.filter_queryset(qs, query)
+    return qs
+
+
+def course_queryset(category=None, query=None):
+    qs = Course.objects.select_related('category')
+    qs = _filter_category(qs, category)
+    if query:
+        qs = search.filter_queryset(qs, query)
+    return qs
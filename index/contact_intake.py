@@ -0,0 +1,156 @@
+"""
+دریافت ناهمگام پیام‌های فرم تماس.
+
+ویو فقط فرم را اعتبارسنجی، محدودیت نرخ را بررسی و پیام را در صف پروسه قرار می‌دهد و
+بلافاصله redirect می‌کند (PRG). یک ترد پس‌زمینه پیام‌ها را تا CONTACT_INTAKE_BATCH_SIZE
+عدد یا CONTACT_INTAKE_BATCH_WINDOW ثانیه جمع می‌کند، با یک bulk_create ذخیره و برای
+هر دسته یک ایمیل اطلاع‌رسانی به کارکنان می‌فرستد.
+
+محدودیت نرخ هر IP یک شمارنده پنجره ثابت در کش مشترک (L2) است: حداکثر
+CONTACT_THROTTLE_LIMIT پیام در هر CONTACT_THROTTLE_WINDOW ثانیه. شمارش با add و incr
+اتمی انجام می‌شود و از L1 پروسه نمی‌گذرد، پس پروسه‌ها و درخواست‌های هم‌زمان سهمیه را دور
+نمی‌زنند و سیل درخواست‌های اسپم قبل از رسیدن به صف و دیتابیس رد می‌شود.
+
+اگر صف پر باشد پیام همان لحظه ذخیره می‌شود. در کرش پروسه پیام‌های صف (حداکثر
+CONTACT_INTAKE_MAX_QUEUE) از دست می‌روند؛ در خاموشی عادی صف با atexit تخلیه می‌شود.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.mail import send_mail
+from django.db import DatabaseError, connections
+
+from .models import ContactMessage
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = getattr(settings, 'CONTACT_INTAKE_BATCH_SIZE', 50)
+BATCH_WINDOW = getattr(settings, 'CONTACT_INTAKE_BATCH_WINDOW', 2)
+MAX_QUEUE = getattr(settings, 'CONTACT_INTAKE_MAX_QUEUE', 1000)
+THROTTLE_LIMIT = getattr(settings, 'CONTACT_THROTTLE_LIMIT', 3)
+THROTTLE_WINDOW = getattr(settings, 'CONTACT_THROTTLE_WINDOW', 180)
+NOTIFY_EMAILS = getattr(settings, 'CONTACT_NOTIFY_EMAILS', None)
+
+_queue = queue.Queue(maxsize=MAX_QUEUE)
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def allow(ip):
+    """شمارنده پنجره ثابت هر IP؛ True یعنی پیام پذیرفته می‌شود و در سهمیه شمرده شد."""
+    store = caches['shared']
+    window = int(time.time() // THROTTLE_WINDOW)
+    key = f'contact_throttle:{ip}:{window}'
+    store.add(key, 0, THROTTLE_WINDOW + 1)
+    try:
+        count = store.incr(key)
+    except ValueError:
+        # کلید بین add و incr منقضی شد؛ این درخواست اولین پیام پنجره است
+        store.add(key, 1, THROTTLE_WINDOW + 1)
+        return True
+    return count <= THROTTLE_LIMIT
+
+
+def submit(data):
+    """data: cleaned_data فرم تماس. پیام در صف ذخیره دسته‌ای قرار می‌گیرد."""
+    message = ContactMessage(**data)
+    try:
+        _queue.put_nowait(message)
+    except queue.Full:
+        logger.warning("صف پیام‌های تماس پر است؛ پیام همزمان ذخیره می‌شود")
+        _save([message])
+        return
+    _ensure_worker()
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='contact-intake', daemon=True)
+            _worker.start()
+
+
+def _take_batch(block=True):
+    batch = []
+    try:
+        batch.append(_queue.get(block=block))
+    except queue.Empty:
+        return batch
+    deadline = time.monotonic() + BATCH_WINDOW
+    while len(batch) < BATCH_SIZE:
+        remaining = deadline - time.monotonic() if block else 0
+        try:
+            batch.append(_queue.get(timeout=remaining) if remaining > 0 else _queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _run():
+    while True:
+        batch = _take_batch()
+        try:
+            _save(batch)
+        except Exception:
+            logger.exception("ذخیره %d پیام تماس ناموفق بود", len(batch))
+            time.sleep(BATCH_WINDOW)
+        finally:
+            # اتصال‌های این ترد بین دسته‌ها باز نمی‌مانند
+            connections.close_all()
+
+
+def _save(batch):
+    try:
+        ContactMessage.objects.bulk_create(batch)
+    except DatabaseError:
+        # دسته در صف می‌ماند تا دفعه بعد دوباره تلاش شود
+        for message in batch:
+            try:
+                _queue.put_nowait(message)
+            except queue.Full:
+                logger.error("پیام تماس %s از دست رفت", message.email)
+        raise
+    notify(batch)
+
+
+def recipients():
+    if NOTIFY_EMAILS is not None:
+        return list(NOTIFY_EMAILS)
+    users = get_user_model().objects.filter(is_staff=True, is_active=True).exclude(email='')
+    return list(users.values_list('email', flat=True))
+
+
+def notify(batch):
+    """یک ایمیل برای هر دسته پیام؛ خطای ارسال ذخیره پیام‌ها را برنمی‌گرداند."""
+    to = recipients()
+    if not batch or not to:
+        return
+    subject = f"{len(batch)} پیام تماس جدید" if len(batch) > 1 else f"پیام تماس جدید: {batch[0].subject}"
+    body = "\n\n".join(
+        f"از: {message.name} <{message.email}> {message.phone}\nموضوع: {message.subject}\n\n{message.message}"
+        for message in batch
+    )
+    try:
+        send_mail(subject, body, None, to)
+    except Exception:
+        logger.exception("ارسال ایمیل اطلاع‌رسانی پیام‌های تماس ناموفق بود")
+
+
+def flush():
+    """ذخیره همه پیام‌های صف در همین ترد (خاموشی پروسه، دستورات مدیریتی و تست)."""
+    while True:
+        batch = _take_batch(block=False)
+        if not batch:
+            return
+        _save(batch)
+
+
+atexit.register(flush)
@@ -0,0 +1,74 @@
+"""
+شمارنده‌های تجمیعی صفحه درباره ما (فارغ‌التحصیلان، دوره‌ها، اساتید).
+
+به‌جای COUNT(*) در هر بازدید، سیگنال‌های ایجاد و حذف هر مدل شمرده‌شده در همان تراکنش
+یک ردیف StatCounter را با F() کم و زیاد می‌کنند. هر شمارنده SHARDS ردیف دارد و هر
+تغییر یک ردیف تصادفی را به‌روز می‌کند، پس ثبت هم‌زمان نتایج آزمون پشت قفل یک ردیف
+صف نمی‌کشد. مقادیر با یک کوئری GROUP BY خوانده و COUNTERS_CACHE_TIMEOUT ثانیه کش
+می‌شوند.
+
+ایجاد یا حذف انبوه (bulk_create، update و SQL خام) سیگنال نمی‌فرستد؛ دستور
+reconcile_counters شمارنده‌ها را با شمارش واقعی تطبیق می‌دهد.
+"""
+import random
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+
+from .models import StatCounter
+
+
+SHARDS = 8
+TIMEOUT = getattr(settings, 'COUNTERS_CACHE_TIMEOUT', 60)
+CACHE_KEY = 'stat_counters'
+
+# نام شمارنده -> مدلی که ردیف‌هایش شمرده می‌شود
+SOURCES = {
+    'graduates': 'accounts.ExamResult',
+    'courses': 'index.Course',
+    'teachers': 'index.Author',
+}
+NAMES_BY_LABEL = {label: name for name, label in SOURCES.items()}
+
+
+def increment(name, delta=1):
+    """تغییر شمارنده در تراکنش جاری."""
+    shard = random.randrange(SHARDS)
+    counters = StatCounter.objects.filter(name=name, shard=shard)
+    if not counters.update(value=F('value') + delta):
+        counter, created = StatCounter.objects.get_or_create(name=name, shard=shard, defaults={'value': delta})
+        if not created:
+            counters.update(value=F('value') + delta)
+
+
+def values():
+    """{نام شمارنده: مقدار} برای همه SOURCES (کش‌شده)."""
+    result = cache.get(CACHE_KEY)
+    if result is None:
+        result = dict.fromkeys(SOURCES, 0)
+        totals = StatCounter.objects.filter(name__in=SOURCES).values_list('name').annotate(total=Sum('value')).order_by()
+        result.update(totals)
+        cache.set(CACHE_KEY, result, TIMEOUT)
+    return result
+
+
+def reconcile(names=None):
+    """
+    شمارنده‌ها را با COUNT(*) واقعی بازنویسی می‌کند (همه در یک ردیف shard صفر).
+    خروجی: {نام: (مقدار قبلی، مقدار درست)}
+    """
+    report = {}
+    for name in names or SOURCES:
+        model = apps.get_model(SOURCES[name])
+        with transaction.atomic():
+            # قفل ردیف‌های موجود تا افزایش‌های هم‌زمان بین شمارش و بازنویسی گم نشوند
+            rows = list(StatCounter.objects.select_for_update().filter(name=name).values_list('value', flat=True))
+            actual = model.objects.count()
+            StatCounter.objects.filter(name=name).delete()
+            StatCounter.objects.create(name=name, shard=0, value=actual)
+        report[name] = (sum(rows), actual)
+    cache.delete(CACHE_KEY)
+    return report
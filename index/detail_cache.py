@@ -0,0 +1,45 @@
+"""
+کش HTML رندرشده صفحه جزئیات مقاله.
+
+کلید شامل اسلاگ، زمان آخرین ویرایش مقاله و یک نسخه سراسری است. ویرایش خود مقاله
+با تغییر updated_at کلید را عوض می‌کند و سیگنال‌های Article/Category/Author نسخه را
+بالا می‌برند. تعداد بازدید تنها بخش متغیر صفحه است و بعد از خواندن از کش جایگذاری می‌شود.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+
+TIMEOUT = getattr(settings, 'ARTICLE_DETAIL_CACHE_TIMEOUT', 60 * 60)
+VERSION_KEY = 'article_detail:version'
+VIEWS_PLACEHOLDER = '\x00article-views\x00'
+
+
+def _key(slug, updated_at):
+    version = cache.get_or_set(VERSION_KEY, time.time_ns, None)
+    return f'article_detail:{version}:{slug}:{updated_at.timestamp()}'
+
+
+def get_or_render(article_ref, build_context):
+    """
+    HTML صفحه را از کش برمی‌گرداند یا با build_context() می‌سازد.
+    article_ref فقط به slug، updated_at و views نیاز دارد.
+    """
+    key = _key(article_ref.slug, article_ref.updated_at)
+    html = cache.get(key)
+    if html is None:
+        context = build_context()
+        context['article_views'] = VIEWS_PLACEHOLDER
+        html = render_to_string('index/detail.html', context)
+        cache.set(key, html, TIMEOUT)
+    return html.replace(VIEWS_PLACEHOLDER, str(article_ref.views))
+
+
+def invalidate():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # کلید نسخه حذف شده؛ مقدار زمانی با نسخه‌های قدیمی برخورد نمی‌کند
+        cache.set(VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,14 @@
+from django import forms
+
+from .models import ContactMessage
+
+
+class ContactForm(forms.ModelForm):
+    class Meta:
+        model = ContactMessage
+        fields = ('name', 'phone', 'email', 'subject', 'message')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # مثل قبل، شماره تماس اجباری نیست
+        self.fields['phone'].required = False
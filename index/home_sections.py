@@ -0,0 +1,124 @@
+"""
+کش بخش‌به‌بخش صفحه اصلی.
+
+هر بخش (دسته‌بندی‌ها، ترفندها، نظرات) به صورت HTML جدا رندر و با کلید خودش کش
+می‌شود. هر بخش یک شماره نسخه دارد که سیگنال‌های مدل‌های همان بخش بعد از commit
+بالا می‌برند؛ مقدار کش‌شده نسخه‌ای را که هنگام ساخت خوانده شده نگه می‌دارد، پس بخشی
+که هم‌زمان با ویرایش ساخته شده کهنه شناخته می‌شود.
+
+برای جلوگیری از هجوم هم‌زمان (stampede)، بخش کهنه یا منقضی فقط توسط پروسه‌ای که
+قفل را با cache.add بگیرد ساخته می‌شود و بقیه تا آن زمان نسخه قبلی را نشان می‌دهند.
+صفحه اصلی گرم فقط یک get_many از کش می‌خواند و به دیتابیس سر نمی‌زند.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .models import Article, Category, Testimonial
+
+
+# بعد از این مدت (ثانیه) بخش حتی بدون سیگنال دوباره ساخته می‌شود
+TIMEOUT = getattr(settings, 'HOME_SECTION_CACHE_TIMEOUT', 60 * 60)
+# نسخه کهنه تا این مدت برای نمایش هنگام ساخت دوباره در کش می‌ماند
+STALE_TIMEOUT = TIMEOUT * 24
+LOCK_TIMEOUT = 30
+# پروسه‌ای که قفل را نگرفته و نسخه کهنه هم ندارد حداکثر این مدت منتظر سازنده می‌ماند
+LOCK_WAIT = 2
+POLL_INTERVAL = 0.05
+
+
+def _categories():
+    return {'categories': Category.objects.only('name', 'icon')}
+
+
+def _tips():
+    return {
+        'latest_articles': Article.objects.select_related('category').defer('content').order_by('-created_at')[:4],
+    }
+
+
+def _testimonials():
+    return {'testimonials': Testimonial.objects.order_by('-date')[:3]}
+
+
+# نام بخش -> (تمپلیت، تابع ساخت context، مدل‌هایی که تغییرشان بخش را کهنه می‌کند)
+SECTIONS = {
+    'categories': ('index/home/categories.html', _categories, (Category,)),
+    'tips': ('index/home/tips.html', _tips, (Article, Category)),
+    'testimonials': ('index/home/testimonials.html', _testimonials, (Testimonial,)),
+}
+# بخش‌هایی که تصاویرشان با تگ picture (srcset نسخه‌های کوچک‌شده) رندر می‌شود
+IMAGE_SECTIONS = ('tips', 'testimonials')
+
+
+def _key(name):
+    return f'home_section:{name}'
+
+
+def _version_key(name):
+    return f'home_section:{name}:version'
+
+
+def _lock_key(name):
+    return f'home_section:{name}:lock'
+
+
+def sections_for(model):
+    return tuple(name for name, (_, _, models) in SECTIONS.items() if model in models)
+
+
+def render_sections():
+    """{نام بخش: HTML}؛ بخش‌های تازه همه با یک get_many از کش خوانده می‌شوند."""
+    keys = [key for name in SECTIONS for key in (_key(name), _version_key(name))]
+    found = cache.get_many(keys)
+    now = time.time()
+    result = {}
+    for name in SECTIONS:
+        version = found.get(_version_key(name))
+        entry = found.get(_key(name))  # (نسخه، زمان انقضای نرم، HTML)
+        if entry is not None and version is not None and entry[0] == version and entry[1] > now:
+            html = entry[2]
+        else:
+            html = _refresh(name, version, entry)
+        result[name] = mark_safe(html)
+    return result
+
+
+def _refresh(name, version, entry):
+    if cache.add(_lock_key(name), 1, LOCK_TIMEOUT):
+        try:
+            return _build(name, version)
+        finally:
+            cache.delete(_lock_key(name))
+    if entry is not None:
+        # پروسه دیگری در حال ساخت است؛ تا آن زمان نسخه قبلی نمایش داده می‌شود
+        return entry[2]
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(_key(name))
+        if entry is not None:
+            return entry[2]
+    return _build(name, version)
+
+
+def _build(name, version):
+    if version is None:
+        cache.add(_version_key(name), time.time_ns(), None)
+        version = cache.get(_version_key(name))
+    template, build_context, _ = SECTIONS[name]
+    html = render_to_string(template, build_context())
+    cache.set(_key(name), (version, time.time() + TIMEOUT, html), STALE_TIMEOUT)
+    return html
+
+
+def invalidate(*names):
+    for name in names:
+        try:
+            cache.incr(_version_key(name))
+        except ValueError:
+            # کلید نسخه حذف شده؛ مقدار زمانی با نسخه‌های قدیمی برخورد نمی‌کند
+            cache.set(_version_key(name), time.time_ns(), None)
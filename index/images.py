@@ -0,0 +1,167 @@
+"""
+نسخه‌های کوچک‌شده (WebP/AVIF) تصاویر آپلودی برای srcset.
+
+برای هر تصویر، در عرض‌های IMAGE_DERIVATIVE_WIDTHS (بدون بزرگ‌نمایی) و در عرض خود
+تصویر اصلی فایل‌هایی کنار تصویر اصلی در پوشه _derived ساخته می‌شود:
+    articles/Site.jpg → articles/_derived/Site-320.webp, ..., articles/_derived/Site-full.webp
+نسخه full باعث می‌شود srcset هر <source> تا عرض اصلی برسد و مرورگر در صفحه‌های عریض
+نسخه کوچک‌تر را بزرگ‌نمایی نکند.
+
+ساخت بعد از ذخیره مدل در یک ThreadPool پس‌زمینه انجام می‌شود (Pillow هنگام تغییر
+اندازه و فشرده‌سازی GIL را آزاد می‌کند). فهرست نسخه‌های موجود هر تصویر در کش
+نگه داشته می‌شود تا تمپلیت‌ها برای ساخت srcset به فایل‌سیستم سر نزنند.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, features
+
+from . import detail_cache, home_sections
+from .models import Article, Author, Course, Testimonial
+
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = tuple(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (320, 640, 1024)))
+WORKERS = getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2)
+QUALITY = {'avif': 55, 'webp': 75}
+# ترتیب مهم است: مرورگر اولین <source> قابل پشتیبانی را انتخاب می‌کند
+FORMATS = tuple(fmt for fmt in ('avif', 'webp') if features.check(fmt))
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+DERIVED_DIR = '_derived'
+# پسوند نسخه هم‌اندازه با تصویر اصلی (عرضش از هدر همان فایل خوانده می‌شود)
+FULL = 'full'
+MANIFEST_TIMEOUT = 60 * 60 * 24
+
+IMAGE_FIELDS = {
+    Article: ('featured_image',),
+    Course: ('image',),
+    Author: ('avatar',),
+    Testimonial: ('avatar',),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def derivative_name(name, width, fmt):
+    folder, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(folder, DERIVED_DIR, f"{stem}-{width}.{fmt}")
+
+
+def _manifest_key(name):
+    return f'image_derivatives:{name}'
+
+
+def manifest(field_file):
+    """
+    {fmt: [(width, name), ...]} برای نسخه‌های موجود یک فایل تصویر.
+    نتیجه در کش نگه داشته می‌شود؛ بار اول با بررسی فایل‌ها ساخته می‌شود.
+    """
+    if not field_file:
+        return {}
+    key = _manifest_key(field_file.name)
+    result = cache.get(key)
+    if result is None:
+        storage = field_file.storage
+        result = {}
+        full_width = None
+        for fmt in FORMATS:
+            entries = [
+                (width, derivative_name(field_file.name, width, fmt))
+                for width in WIDTHS
+                if storage.exists(derivative_name(field_file.name, width, fmt))
+            ]
+            full = derivative_name(field_file.name, FULL, fmt)
+            if storage.exists(full):
+                full_width = full_width or _width(storage, full)
+                if full_width and all(width < full_width for width, _ in entries):
+                    entries.append((full_width, full))
+            result[fmt] = entries
+        cache.set(key, result, MANIFEST_TIMEOUT)
+    return result
+
+
+def _width(storage, name):
+    try:
+        with storage.open(name, 'rb') as fh:
+            # Image.open فقط هدر فایل را می‌خواند
+            return Image.open(fh).width
+    except (OSError, ValueError):
+        return None
+
+
+def srcset(field_file, fmt):
+    storage = field_file.storage
+    return ', '.join(f"{storage.url(name)} {width}w" for width, name in manifest(field_file).get(fmt, []))
+
+
+def generate(name, storage, force=False):
+    """ساخت همه نسخه‌های یک تصویر؛ تعداد بایت‌های نوشته‌شده را برمی‌گرداند."""
+    written = 0
+    with storage.open(name, 'rb') as fh:
+        source = ImageOps.exif_transpose(Image.open(fh))
+        source.load()
+    if source.mode not in ('RGB', 'RGBA'):
+        source = source.convert('RGBA' if 'transparency' in source.info else 'RGB')
+
+    sizes = [
+        (width, (width, round(source.height * width / source.width)))
+        for width in WIDTHS
+        if width < source.width
+    ]
+    sizes.append((FULL, source.size))
+    for width, size in sizes:
+        resized = None
+        for fmt in FORMATS:
+            target = derivative_name(name, width, fmt)
+            if not force and storage.exists(target):
+                continue
+            if resized is None:
+                resized = source if size == source.size else source.resize(size, Image.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, fmt.upper(), quality=QUALITY[fmt])
+            if storage.exists(target):
+                storage.delete(target)
+            # ذخیره‌سازی مبتنی بر هش نام فایل را عوض می‌کند؛ نسخه‌ها باید نام قطعی داشته باشند
+            save = getattr(storage, 'save_at', storage.save)
+            save(target, ContentFile(buffer.getvalue()))
+            written += buffer.tell()
+
+    cache.delete(_manifest_key(name))
+    if written:
+        # صفحات جزئیات و بخش‌های صفحه اصلی کش‌شده srcset جدید را دریافت کنند
+        detail_cache.invalidate()
+        home_sections.invalidate(*home_sections.IMAGE_SECTIONS)
+    return written
+
+
+def _generate_safely(name, storage):
+    try:
+        generate(name, storage)
+    except Exception:
+        logger.exception("ساخت نسخه‌های تصویر %s ناموفق بود", name)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='image-derivatives')
+    return _executor
+
+
+def schedule(field_file):
+    """ساخت نسخه‌ها در پس‌زمینه بعد از commit تراکنش جاری."""
+    if not field_file or not FORMATS:
+        return
+    name, storage = field_file.name, field_file.storage
+    transaction.on_commit(lambda: _get_executor().submit(_generate_safely, name, storage))
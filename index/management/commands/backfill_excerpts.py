@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from index.models import Article
+
+
+class Command(BaseCommand):
+    help = "محاسبه دوباره خلاصه و زمان خواندن همه مقالات از روی محتوا."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch, total = [], 0
+        for article in Article.objects.only('id', 'content').iterator(chunk_size=batch_size):
+            article.update_derived_fields()
+            batch.append(article)
+            if len(batch) >= batch_size:
+                total += self.write(batch)
+                batch = []
+        total += self.write(batch)
+        self.stdout.write(self.style.SUCCESS(f"{total} مقاله به‌روزرسانی شد."))
+
+    def write(self, batch):
+        if batch:
+            Article.objects.bulk_update(batch, ['excerpt', 'reading_time'])
+        return len(batch)
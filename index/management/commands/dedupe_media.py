@@ -0,0 +1,127 @@
+import os
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+
+from core.storage import BLOB_DIR, ContentAddressedStorage, blob_name, content_hash
+from index import detail_cache, images
+
+
+class Command(BaseCommand):
+    help = (
+        "انتقال فایل‌های آپلودی موجود به ذخیره‌سازی مبتنی بر هش: فایل‌های تکراری یک‌بار "
+        "نگه داشته می‌شوند، رکوردها به فایل مشترک اشاره می‌کنند و حجم آزادشده گزارش می‌شود."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="فقط گزارش، بدون تغییر فایل یا دیتابیس")
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.deleted = self.written = 0
+        self.blobs = set()
+        self.derived = set()
+
+        fields = self.file_fields()
+        if not fields:
+            raise CommandError("هیچ فیلد فایلی با ContentAddressedStorage پیدا نشد؛ STORAGES را بررسی کنید.")
+        self.storage = fields[0][0]._meta.get_field(fields[0][1]).storage
+
+        references = defaultdict(list)
+        for model, field_name in fields:
+            names = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            for name in names.values_list(field_name, flat=True).distinct():
+                references[name].append((model, field_name))
+
+        moved = rows = missing = 0
+        for name, targets in references.items():
+            if name.startswith(f'{BLOB_DIR}/'):
+                self.blobs.add(name)
+                continue
+            if not self.storage.exists(name):
+                missing += 1
+                self.stderr.write(f"فایل {name} پیدا نشد؛ رد شد.")
+                continue
+            blob = self.store(name)
+            if not self.dry_run:
+                with transaction.atomic():
+                    for model, field_name in targets:
+                        rows += model.objects.filter(**{field_name: name}).update(**{field_name: blob})
+            self.move_derivatives(name, blob)
+            self.delete(name)
+            moved += 1
+
+        orphans = self.remove_duplicate_orphans(fields, references)
+
+        if not self.dry_run:
+            detail_cache.invalidate()
+        reclaimed = self.deleted - self.written
+        prefix = "[dry-run] " if self.dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{moved} فایل به {len(self.blobs)} فایل یکتا منتقل شد ({rows} رکورد به‌روز شد)؛ "
+            f"{orphans} فایل تکراری بدون ارجاع حذف شد؛ {missing} فایل پیدا نشد. "
+            f"حجم آزادشده: {reclaimed / 1024:.0f} KB."
+        ))
+
+    def file_fields(self):
+        result = []
+        for model in apps.get_app_config('index').get_models():
+            for field in model._meta.get_fields():
+                if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage):
+                    result.append((model, field.name))
+        return result
+
+    def store(self, name):
+        """کپی فایل به مسیر هش (اگر قبلاً وجود نداشته باشد) و برگرداندن نام جدید."""
+        with self.storage.open(name, 'rb') as fh:
+            blob = blob_name(content_hash(fh), name)
+            if blob not in self.blobs and not self.storage.exists(blob):
+                self.written += self.storage.size(name)
+                if not self.dry_run:
+                    self.storage.save_at(blob, fh)
+        self.blobs.add(blob)
+        return blob
+
+    def move_derivatives(self, name, blob):
+        # نسخه‌های WebP/AVIF ساخته‌شده هم به نام جدید منتقل می‌شوند تا لازم به ساخت دوباره نباشند
+        for width in images.WIDTHS + (images.FULL,):
+            for fmt in images.FORMATS:
+                source = images.derivative_name(name, width, fmt)
+                if not self.storage.exists(source):
+                    continue
+                target = images.derivative_name(blob, width, fmt)
+                if target not in self.derived and not self.storage.exists(target):
+                    self.written += self.storage.size(source)
+                    self.derived.add(target)
+                    if not self.dry_run:
+                        with self.storage.open(source, 'rb') as fh:
+                            self.storage.save_at(target, fh)
+                self.delete(source)
+        if not self.dry_run:
+            cache.delete(images._manifest_key(blob))
+
+    def remove_duplicate_orphans(self, fields, references):
+        """حذف فایل‌های بدون ارجاع در پوشه‌های آپلود که محتوایشان در یک blob موجود است."""
+        removed = 0
+        folders = {model._meta.get_field(field_name).upload_to for model, field_name in fields}
+        for folder in folders:
+            if not isinstance(folder, str) or not self.storage.exists(folder):
+                continue
+            for filename in self.storage.listdir(folder)[1]:
+                name = os.path.join(folder, filename)
+                if name in references:
+                    continue
+                with self.storage.open(name, 'rb') as fh:
+                    blob = blob_name(content_hash(fh), name)
+                if blob in self.blobs or self.storage.exists(blob):
+                    self.delete(name)
+                    removed += 1
+        return removed
+
+    def delete(self, name):
+        self.deleted += self.storage.size(name)
+        if not self.dry_run:
+            self.storage.delete(name)
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from index import images
+
+
+class Command(BaseCommand):
+    help = "ساخت نسخه‌های WebP/AVIF در چند عرض برای همه تصاویر موجود."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=images.WORKERS)
+        parser.add_argument('--force', action='store_true', help="ساخت دوباره نسخه‌های موجود")
+
+    def handle(self, *args, **options):
+        jobs = {}
+        for model, fields in images.IMAGE_FIELDS.items():
+            for field_name in fields:
+                storage = model._meta.get_field(field_name).storage
+                for name in model.objects.exclude(**{field_name: ''}).values_list(field_name, flat=True).distinct():
+                    jobs[name] = storage
+
+        originals = written = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {
+                pool.submit(images.generate, name, storage, options['force']): (name, storage)
+                for name, storage in jobs.items()
+            }
+            for future in as_completed(futures):
+                name, storage = futures[future]
+                try:
+                    written += future.result()
+                    originals += storage.size(name)
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"{name}: {exc}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(jobs) - failed} تصویر پردازش شد؛ حجم اصلی {originals / 1024:.0f} KB، "
+            f"نسخه‌های جدید {written / 1024:.0f} KB."
+        ))
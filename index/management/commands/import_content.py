@@ -0,0 +1,294 @@
+import csv
+import json
+import os
+import time
+from pathlib import Path
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.text import slugify
+
+from core.cache import invalidate_tags
+from index import counters, detail_cache, home_sections, search, slugs, tags
+from index.models import Article, Author, Category, Course, Tag
+from index.signals import VIEW_CACHE_TAGS
+
+
+RECORD_TYPES = ('author', 'category', 'article', 'course')
+# فیلدهای الزامی هر نوع رکورد
+REQUIRED_FIELDS = {
+    'author': ('name',),
+    'category': ('name',),
+    'article': ('title',),
+    'course': ('title', 'start_date'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "ورود انبوه نویسنده، دسته‌بندی، مقاله و دوره از فایل JSONL یا CSV. "
+        "در JSONL هر خط یک رکورد با کلید type است؛ برای CSV نوع رکوردها با --type مشخص می‌شود."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="مسیر فایل .jsonl یا .csv")
+        parser.add_argument('--type', choices=RECORD_TYPES, help="نوع همه رکوردها (برای CSV الزامی)")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--media-dir',
+            help="پوشه فایل‌های تصویر منبع؛ در صورت تعیین، تصاویر در MEDIA_ROOT کپی می‌شوند",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"فایل {path} پیدا نشد.")
+        if path.suffix == '.csv' and not options['type']:
+            raise CommandError("برای فایل CSV باید --type مشخص شود.")
+
+        self.batch_size = options['batch_size']
+        self.media_dir = Path(options['media_dir']) if options['media_dir'] else None
+        self.default_type = options['type']
+
+        # نگاشت نام → شناسه در حافظه برای حل کلیدهای خارجی بدون کوئری به ازای هر ردیف
+        self.category_ids = dict(Category.objects.values_list('name', 'id'))
+        self.category_ids.update(Category.objects.values_list('slug', 'id'))
+        self.author_ids = {}
+        for name, pk in Author.objects.values_list('name', 'id').order_by('-id'):
+            self.author_ids[name] = pk
+
+        self.tag_ids = {}
+
+        self.buffers = {record_type: [] for record_type in RECORD_TYPES}
+        self.counts = {record_type: 0 for record_type in RECORD_TYPES}
+        self.unresolved = 0
+        self.started = time.monotonic()
+        self.last_report = 0
+
+        for line_no, record in enumerate(self.read_records(path), start=1):
+            record_type = record.pop('type', None) or self.default_type
+            if record_type not in RECORD_TYPES:
+                raise CommandError(f"ردیف {line_no}: نوع رکورد نامعتبر است: {record_type!r}")
+            self.validate(line_no, record_type, record)
+            self.buffers[record_type].append(record)
+            if len(self.buffers[record_type]) >= self.batch_size:
+                self.flush(record_type)
+
+        for record_type in RECORD_TYPES:
+            self.flush(record_type)
+
+        # bulk_create سیگنال post_save نمی‌فرستد
+        detail_cache.invalidate()
+        invalidate_tags(*(VIEW_CACHE_TAGS[model] for model in (Article, Course, Category, Tag)))
+        home_sections.invalidate(*home_sections.SECTIONS)
+        counters.reconcile(['courses', 'teachers'])
+
+        self.report(final=True)
+        if self.unresolved:
+            self.stdout.write(self.style.WARNING(
+                f"{self.unresolved} ارجاع به دسته‌بندی یا نویسنده پیدا نشد و خالی ماند."
+            ))
+
+    def read_records(self, path):
+        with path.open(encoding='utf-8', newline='') as fh:
+            if path.suffix == '.csv':
+                yield from csv.DictReader(fh)
+                return
+            for line_no, line in enumerate(fh, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise CommandError(f"ردیف {line_no}: JSON نامعتبر ({exc})")
+
+    def validate(self, line_no, record_type, record):
+        """بررسی فیلدهای الزامی و تبدیل تاریخ‌ها و اعداد قبل از ورود به بافر."""
+        for name in REQUIRED_FIELDS[record_type]:
+            if not record.get(name):
+                raise CommandError(f"ردیف {line_no}: فیلد {name} خالی است.")
+        parsers = {'views': int}
+        if record_type == 'article':
+            parsers['created_at'] = parse_datetime
+        elif record_type == 'course':
+            parsers['start_date'] = parse_date
+        for name, parse in parsers.items():
+            value = record.get(name)
+            if not value:
+                continue
+            try:
+                parsed = parse(value)
+            except (ValueError, TypeError):
+                parsed = None
+            if parsed is None:
+                raise CommandError(f"ردیف {line_no}: مقدار {name} نامعتبر است: {value!r}")
+            record[name] = parsed
+
+    def flush(self, record_type):
+        records = self.buffers[record_type]
+        if not records:
+            return
+        # دسته‌بندی‌ها و نویسندگان باید قبل از مقالات و دوره‌ها ثبت شوند
+        if record_type in ('article', 'course'):
+            self.flush('category')
+            self.flush('author')
+        self.buffers[record_type] = []
+
+        creators = {
+            'author': self.create_authors,
+            'category': self.create_categories,
+            'article': self.create_articles,
+            'course': self.create_courses,
+        }
+        with transaction.atomic():
+            creators[record_type](records)
+        self.counts[record_type] += len(records)
+        self.report()
+
+    def report(self, final=False):
+        total = sum(self.counts.values())
+        if not final and total - self.last_report < self.batch_size * 10:
+            return
+        self.last_report = total
+        elapsed = time.monotonic() - self.started
+        rate = total / elapsed if elapsed else total
+        summary = ', '.join(f"{name}: {count}" for name, count in self.counts.items())
+        style = self.style.SUCCESS if final else (lambda text: text)
+        self.stdout.write(style(f"{summary} — {total} ردیف در {elapsed:.1f} ثانیه ({rate:.0f} ردیف/ثانیه)"))
+
+    # -------------------------------------------------- media / FK helpers
+
+    def image(self, value, upload_to, storage):
+        if not value:
+            return ''
+        if self.media_dir is None:
+            return value
+        source = self.media_dir / value
+        if not source.exists():
+            raise CommandError(f"تصویر {source} پیدا نشد.")
+        with source.open('rb') as fh:
+            return storage.save(os.path.join(upload_to, source.name), File(fh))
+
+    def resolve(self, mapping, name):
+        if not name:
+            return None
+        pk = mapping.get(name)
+        if pk is None:
+            self.unresolved += 1
+        return pk
+
+    # -------------------------------------------------- creators
+
+    def create_categories(self, records):
+        objs = []
+        for r in records:
+            if r['name'] in self.category_ids:
+                continue
+            objs.append(Category(
+                name=r['name'],
+                slug=r.get('slug') or slugify(r['name'], allow_unicode=True),
+                icon=r.get('icon', ''),
+            ))
+            # جلوگیری از تکرار نام در همان دسته
+            self.category_ids[r['name']] = None
+        Category.objects.bulk_create(objs)
+        self.refresh_ids(Category, objs, self.category_ids, 'name', also='slug')
+
+    def create_authors(self, records):
+        field = Author._meta.get_field('avatar')
+        objs = []
+        for r in records:
+            # نویسنده موجود (در دیتابیس یا همین فایل) دوباره ساخته نمی‌شود
+            if r['name'] in self.author_ids:
+                continue
+            objs.append(Author(
+                name=r['name'],
+                bio=r.get('bio', ''),
+                avatar=self.image(r.get('avatar'), field.upload_to, field.storage),
+            ))
+            self.author_ids[r['name']] = None
+        Author.objects.bulk_create(objs)
+        self.refresh_ids(Author, objs, self.author_ids, 'name')
+
+    def refresh_ids(self, model, objs, mapping, key, also=None):
+        # بک‌اندهایی که شناسه را از bulk_create برنمی‌گردانند با یک کوئری جبران می‌شوند
+        missing = [getattr(obj, key) for obj in objs if obj.pk is None]
+        if missing:
+            lookup = dict(model.objects.filter(**{f'{key}__in': missing}).values_list(key, 'id'))
+            for obj in objs:
+                obj.pk = obj.pk or lookup.get(getattr(obj, key))
+        for obj in objs:
+            mapping[getattr(obj, key)] = obj.pk
+            if also:
+                mapping[getattr(obj, also)] = obj.pk
+
+    def create_articles(self, records):
+        field = Article._meta.get_field('featured_image')
+        now = timezone.now()
+        objs = [
+            Article(
+                title=r['title'],
+                slug=r.get('slug', ''),
+                category_id=self.resolve(self.category_ids, r.get('category')),
+                author_id=self.resolve(self.author_ids, r.get('author')),
+                content=r.get('content', ''),
+                featured_image=self.image(r.get('featured_image'), field.upload_to, field.storage),
+                created_at=r.get('created_at') or now,
+                views=r.get('views') or 0,
+            )
+            for r in records
+        ]
+        for obj in objs:
+            obj.update_derived_fields()
+        self.prepare_slugs(Article, objs)
+        published = [obj.created_at for obj in objs]
+        Article.objects.bulk_create(objs)
+        # auto_now_add در bulk_create تاریخ اصلی انتشار را بازنویسی می‌کند؛ با یک UPDATE برگردانده می‌شود
+        self.refresh_ids(Article, objs, {}, 'slug')
+        dated = []
+        for obj, created_at, r in zip(objs, published, records):
+            if r.get('created_at') and obj.pk is not None:
+                obj.created_at = created_at
+                dated.append(obj)
+        Article.objects.bulk_update(dated, ['created_at'], batch_size=self.batch_size)
+
+        search.index_instances([obj for obj in objs if obj.pk is not None])
+        tags.link_bulk(
+            [(obj.pk, r.get('tags', '')) for obj, r in zip(objs, records) if r.get('tags')],
+            self.tag_ids,
+        )
+
+    def create_courses(self, records):
+        field = Course._meta.get_field('image')
+        objs = [
+            Course(
+                title=r['title'],
+                slug=r.get('slug', ''),
+                category_id=self.resolve(self.category_ids, r.get('category')),
+                description=r.get('description', ''),
+                image=self.image(r.get('image'), field.upload_to, field.storage),
+                start_date=r['start_date'],
+                duration=r.get('duration', ''),
+                features=r.get('features', ''),
+                views=r.get('views') or 0,
+            )
+            for r in records
+        ]
+        self.prepare_slugs(Course, objs)
+        Course.objects.bulk_create(objs)
+        search.index_instances([obj for obj in objs if obj.pk is not None])
+
+    def prepare_slugs(self, model, objs):
+        # اسلاگ‌های صریح تکراری (در دیتابیس یا همان دسته) دوباره تخصیص داده می‌شوند
+        explicit = [obj.slug for obj in objs if obj.slug]
+        taken = set(model.objects.filter(slug__in=explicit).values_list('slug', flat=True))
+        for obj in objs:
+            if obj.slug and obj.slug in taken:
+                obj.slug = ''
+            elif obj.slug:
+                taken.add(obj.slug)
+        slugs.assign_bulk(objs, reserved=taken)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from index import counters
+
+
+class Command(BaseCommand):
+    help = "تطبیق شمارنده‌های آمار (فارغ‌التحصیلان، دوره‌ها، اساتید) با شمارش واقعی و گزارش اختلاف‌ها."
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f"نام شمارنده‌ها ({', '.join(counters.SOURCES)})؛ پیش‌فرض همه")
+
+    def handle(self, *args, **options):
+        unknown = set(options['names']) - set(counters.SOURCES)
+        if unknown:
+            raise CommandError(f"شمارنده ناشناخته: {', '.join(sorted(unknown))}")
+
+        for name, (stored, actual) in counters.reconcile(options['names']).items():
+            if stored == actual:
+                self.stdout.write(f"{name}: {actual} (بدون اختلاف)")
+            else:
+                self.stdout.write(self.style.WARNING(f"{name}: {stored} → {actual} (اختلاف {actual - stored:+d})"))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-18 10:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0005_aboutcontent_aboutstat_contactmessage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                verbose_name="آخرین ویرایش",
+            ),
+            preserve_default=False,
+        ),
+    ]
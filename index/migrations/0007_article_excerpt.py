@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0006_article_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="excerpt",
+            field=models.CharField(
+                blank=True, editable=False, max_length=300, verbose_name="خلاصه"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="article",
+            name="reading_time",
+            field=models.PositiveIntegerField(
+                default=5, editable=False, verbose_name="زمان خواندن (دقیقه)"
+            ),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.2 on 2026-10-18 11:00
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def split_csv_tags(apps, schema_editor):
+    Article = apps.get_model("index", "Article")
+    Tag = apps.get_model("index", "Tag")
+    Through = Article.tags.through
+
+    tag_ids = {}
+    used_slugs = set()
+    links = []
+    for article_id, csv in Article.objects.exclude(tags_csv="").values_list(
+        "id", "tags_csv"
+    ):
+        seen = set()
+        for raw in csv.split(","):
+            name = " ".join(raw.split()).lower()
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            if name not in tag_ids:
+                # برچسبی که فقط علامت دارد اسلاگ خالی می‌دهد (مثل index.slugs)
+                base = slug = slugify(name, allow_unicode=True) or "tag"
+                num = 1
+                while slug in used_slugs:
+                    slug = f"{base}-{num}"
+                    num += 1
+                used_slugs.add(slug)
+                tag_ids[name] = Tag.objects.create(name=name, slug=slug).pk
+            links.append(Through(article_id=article_id, tag_id=tag_ids[name]))
+    Through.objects.bulk_create(links, batch_size=1000)
+
+
+def join_csv_tags(apps, schema_editor):
+    Article = apps.get_model("index", "Article")
+    for article in Article.objects.prefetch_related("tags"):
+        article.tags_csv = ", ".join(tag.name for tag in article.tags.all())
+        article.save(update_fields=["tags_csv"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0007_article_excerpt"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=100, unique=True, verbose_name="نام برچسب"
+                    ),
+                ),
+                (
+                    "slug",
+                    models.SlugField(
+                        blank=True, max_length=120, unique=True, verbose_name="اسلاگ"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "برچسب",
+                "verbose_name_plural": "برچسب‌ها",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.RenameField(
+            model_name="article",
+            old_name="tags",
+            new_name="tags_csv",
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="tags",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="articles",
+                to="index.tag",
+                verbose_name="تگ‌ها",
+            ),
+        ),
+        migrations.RunPython(split_csv_tags, join_csv_tags),
+        migrations.RemoveField(
+            model_name="article",
+            name="tags_csv",
+        ),
+    ]
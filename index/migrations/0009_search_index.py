@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 12:00
+
+from django.db import migrations
+
+
+def create_search_table(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE index_search USING fts5("
+            "title, body, prefix='2 3', tokenize='unicode61 remove_diacritics 2')"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE TABLE index_search ("
+            "kind smallint NOT NULL, obj_id bigint NOT NULL, document tsvector NOT NULL, "
+            "PRIMARY KEY (kind, obj_id))"
+        )
+        schema_editor.execute(
+            "CREATE INDEX index_search_document ON index_search USING GIN (document)"
+        )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS index_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0008_tag_article_tags_m2m"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
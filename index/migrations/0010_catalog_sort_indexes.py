@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0009_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(fields=["created_at", "id"], name="article_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(fields=["views", "id"], name="article_views_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["reading_time", "id"], name="article_reading_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["start_date", "id"], name="course_start_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["views", "id"], name="course_views_idx"),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:00
+
+from django.db import migrations
+
+
+SINGLETON_PK = 1
+
+
+def keep_single_row(apps, schema_editor):
+    # مثل about_view قبلی، اولین ردیف نگه داشته و به کلید ثابت منتقل می‌شود
+    for name in ("AboutStat", "AboutContent"):
+        model = apps.get_model("index", name)
+        first = model.objects.order_by("pk").values_list("pk", flat=True).first()
+        if first is None:
+            continue
+        model.objects.exclude(pk=first).delete()
+        if first != SINGLETON_PK:
+            model.objects.filter(pk=first).update(pk=SINGLETON_PK)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0010_catalog_sort_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_single_row, migrations.RunPython.noop),
+    ]
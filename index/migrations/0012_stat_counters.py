@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:11
+
+from django.db import migrations, models
+
+
+SOURCES = {
+    "graduates": ("accounts", "ExamResult"),
+    "courses": ("index", "Course"),
+    "teachers": ("index", "Author"),
+}
+
+
+def seed_counters(apps, schema_editor):
+    StatCounter = apps.get_model("index", "StatCounter")
+    StatCounter.objects.bulk_create(
+        [
+            StatCounter(name=name, shard=0, value=apps.get_model(*label).objects.count())
+            for name, label in SOURCES.items()
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0011_singleton_rows"),
+        ("accounts", "0006_leaderboard"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="aboutstat",
+            name="courses",
+        ),
+        migrations.RemoveField(
+            model_name="aboutstat",
+            name="graduates",
+        ),
+        migrations.RemoveField(
+            model_name="aboutstat",
+            name="teachers",
+        ),
+        migrations.CreateModel(
+            name="StatCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, verbose_name="نام")),
+                (
+                    "shard",
+                    models.PositiveSmallIntegerField(default=0, verbose_name="بخش"),
+                ),
+                ("value", models.BigIntegerField(default=0, verbose_name="مقدار")),
+            ],
+            options={
+                "verbose_name": "شمارنده آمار",
+                "verbose_name_plural": "شمارنده\u200cهای آمار",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("name", "shard"), name="statcounter_name_shard_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
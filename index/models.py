@@ -3,6 +3,10 @@ from django.utils.text import slugify
 from django.urls import reverse
 from django_summernote.fields import SummernoteTextField
 
+from core.singleton import SingletonModel
+
+from . import slugs, text, viewcounts
+
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True, verbose_name="نام دسته‌بندی")
@@ -35,6 +39,30 @@ class Author(models.Model):
         return self.name
 
 
+class Tag(models.Model):
+    name = models.CharField(max_length=100, unique=True, verbose_name="نام برچسب")
+    slug = models.SlugField(max_length=120, unique=True, blank=True, verbose_name="اسلاگ")
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = "برچسب"
+        verbose_name_plural = "برچسب‌ها"
+
+    @staticmethod
+    def normalize(name):
+        return ' '.join(name.split()).lower()
+
+    def save(self, *args, **kwargs):
+        self.name = Tag.normalize(self.name)
+        slugs.save_with_unique_slug(self, self.name, super().save, *args, **kwargs)
+
+    def get_absolute_url(self):
+        return reverse('tag_view', args=[self.slug])
+
+    def __str__(self):
+        return self.name
+
+
 class Article(models.Model):
     title = models.CharField(max_length=300, verbose_name="عنوان مقاله")
     slug = models.SlugField(max_length=350, unique=True, blank=True, verbose_name="اسلاگ")
@@ -43,35 +71,40 @@ class Article(models.Model):
     content = SummernoteTextField(verbose_name="محتوای مقاله")
     featured_image = models.ImageField(upload_to='articles/', verbose_name="تصویر اصلی مقاله")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ انتشار")
-    reading_time = models.PositiveIntegerField(default=5, verbose_name="زمان خواندن (دقیقه)")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="آخرین ویرایش")
+    excerpt = models.CharField(max_length=300, blank=True, editable=False, verbose_name="خلاصه")
+    reading_time = models.PositiveIntegerField(default=5, editable=False, verbose_name="زمان خواندن (دقیقه)")
     views = models.PositiveIntegerField(default=0, verbose_name="تعداد بازدید")
-    tags = models.CharField(max_length=500, blank=True, verbose_name="تگ‌ها")
+    tags = models.ManyToManyField(Tag, blank=True, related_name='articles', verbose_name="تگ‌ها")
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # کلیدهای مرتب‌سازی صفحه‌بندی keyset در catalog
+            models.Index(fields=['created_at', 'id'], name='article_created_idx'),
+            models.Index(fields=['views', 'id'], name='article_views_idx'),
+            models.Index(fields=['reading_time', 'id'], name='article_reading_time_idx'),
+        ]
         verbose_name = "مقاله"
         verbose_name_plural = "مقالات"
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title, allow_unicode=True)
-            slug = base_slug
-            num = 1
-            while Article.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{num}"
-                num += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        self.update_derived_fields()
+        slugs.save_with_unique_slug(self, self.title, super().save, *args, **kwargs)
+
+    def update_derived_fields(self):
+        # خلاصه و زمان خواندن یک‌بار هنگام ذخیره محاسبه می‌شوند تا لیست‌ها به content نیاز نداشته باشند
+        self.excerpt = text.make_excerpt(self.content)
+        self.reading_time = text.reading_time(self.content)
 
     def get_absolute_url(self):
         return reverse('article_detail', args=[self.slug])
 
     def increase_views(self):
-        self.views += 1
-        self.save(update_fields=['views'])
-
-    def tag_list(self):
-        return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
+        # افزایش در بافر ثبت می‌شود و به‌صورت دسته‌ای در دیتابیس نوشته می‌شود؛
+        # اگر همین فراخوانی بافر را تخلیه کند، سهم نوشته‌شده جای pending را می‌گیرد
+        flushed = viewcounts.record(self)
+        self.views += flushed + viewcounts.pending_for(self)
 
     def __str__(self):
         return self.title
@@ -90,19 +123,19 @@ class Course(models.Model):
 
     class Meta:
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['start_date', 'id'], name='course_start_date_idx'),
+            models.Index(fields=['views', 'id'], name='course_views_idx'),
+        ]
         verbose_name = "دوره آموزشی"
         verbose_name_plural = "دوره‌های آموزشی"
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title, allow_unicode=True)
-            slug = base_slug
-            num = 1
-            while Course.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{num}"
-                num += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        slugs.save_with_unique_slug(self, self.title, super().save, *args, **kwargs)
+
+    def increase_views(self):
+        flushed = viewcounts.record(self)
+        self.views += flushed + viewcounts.pending_for(self)
 
     def feature_list(self):
         return [f.strip() for f in self.features.split('\n') if f.strip()]
@@ -164,11 +197,9 @@ class ContactMessage(models.Model):
         return f"{self.name} - {self.subject}"
 
 
-class AboutStat(models.Model):
+class AboutStat(SingletonModel):
+    # تعداد فارغ‌التحصیلان، دوره‌ها و اساتید از شمارنده‌های StatCounter خوانده می‌شود
     years_experience = models.PositiveIntegerField(default=25, verbose_name="سال‌های تجربه")
-    graduates = models.PositiveIntegerField(default=5000, verbose_name="دانش‌آموزان فارغ‌التحصیل")
-    courses = models.PositiveIntegerField(default=50, verbose_name="دوره‌های آموزشی")
-    teachers = models.PositiveIntegerField(default=30, verbose_name="اساتید مجرب")
 
     class Meta:
         verbose_name = "آمار درباره ما"
@@ -178,7 +209,27 @@ class AboutStat(models.Model):
         return "آمار درباره ما"
 
 
-class AboutContent(models.Model):
+class StatCounter(models.Model):
+    """
+    شمارنده تجمیعی (مثلاً تعداد دوره‌ها) که با سیگنال‌ها به‌روز می‌شود؛ مقدار هر شمارنده
+    جمع چند ردیف (shard) است تا افزایش‌های هم‌زمان روی یک ردیف قفل نشوند.
+    """
+    name = models.CharField(max_length=50, verbose_name="نام")
+    shard = models.PositiveSmallIntegerField(default=0, verbose_name="بخش")
+    value = models.BigIntegerField(default=0, verbose_name="مقدار")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'shard'], name='statcounter_name_shard_uniq'),
+        ]
+        verbose_name = "شمارنده آمار"
+        verbose_name_plural = "شمارنده‌های آمار"
+
+    def __str__(self):
+        return f"{self.name}[{self.shard}] = {self.value}"
+
+
+class AboutContent(SingletonModel):
     title = models.CharField(max_length=300, default="درباره ما", verbose_name="عنوان صفحه")
     text = SummernoteTextField(verbose_name="متن درباره ما")
     image = models.ImageField(upload_to='about/', verbose_name="تصویر درباره ما", blank=True, null=True)
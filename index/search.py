@@ -0,0 +1,174 @@
+"""
+جستجوی تمام‌متن مقالات و دوره‌ها.
+
+بک‌اند بر اساس دیتابیس انتخاب می‌شود: جدول مجازی FTS5 در SQLite، ستون tsvector با
+ایندکس GIN در PostgreSQL و در غیر این صورت icontains. متن سند و عبارت جستجو هر دو با
+core.text.normalize یکسان‌سازی می‌شوند (ی/ک عربی، نیم‌فاصله، اعراب و ارقام).
+
+ایندکس با سیگنال‌های post_save/post_delete به‌روز می‌شود؛ مسیرهای bulk_create باید
+index_instances را خودشان صدا بزنند.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from core.text import normalize
+
+from . import text
+from .models import Article, Course
+
+
+TABLE = 'index_search'
+
+# rowid هر سند = شناسه * KIND_SLOTS + کد نوع، تا حذف و جایگزینی روی کلید اصلی انجام شود
+KIND_SLOTS = 4
+KIND_CODES = {Article: 1, Course: 2}
+
+_token = re.compile(r'\w+')
+
+
+def document(obj):
+    """(عنوان، بدنه) نرمال‌شده برای ایندکس."""
+    if isinstance(obj, Article):
+        body = text.plain_text(obj.content)
+    else:
+        body = f"{text.plain_text(obj.description)} {obj.features}"
+    return normalize(obj.title), normalize(body)
+
+
+def tokens(query):
+    return _token.findall(normalize(query))
+
+
+class LikeBackend:
+    """بک‌اند پشتیبان بدون ایندکس: جستجوی icontains روی عنوان و متن."""
+
+    fields = {Article: ('title', 'content'), Course: ('title', 'description')}
+
+    def filter(self, queryset, query):
+        condition = Q()
+        for field in self.fields[queryset.model]:
+            condition |= Q(**{f'{field}__icontains': query})
+        return queryset.filter(condition)
+
+    def index(self, instances):
+        pass
+
+    def remove(self, model, pks):
+        pass
+
+    def clear(self):
+        pass
+
+
+class SQLiteBackend:
+    def filter(self, queryset, query):
+        words = tokens(query)
+        if not words:
+            return queryset
+        # کلمات با AND؛ فقط کلمه آخر (که ممکن است نیمه‌تایپ باشد) پیشوندی جستجو می‌شود
+        match = ' '.join(f'"{word}"' for word in words) + '*'
+        code = KIND_CODES[queryset.model]
+        ids = RawSQL(
+            f'SELECT rowid / {KIND_SLOTS} FROM {TABLE} WHERE {TABLE} MATCH %s AND rowid %% {KIND_SLOTS} = {code}',
+            [match],
+        )
+        return queryset.filter(pk__in=ids)
+
+    def index(self, instances):
+        rows = []
+        for obj in instances:
+            title, body = document(obj)
+            rows.append((obj.pk * KIND_SLOTS + KIND_CODES[type(obj)], title, body))
+        if rows:
+            with connection.cursor() as cursor:
+                cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+                cursor.executemany(f'INSERT INTO {TABLE} (rowid, title, body) VALUES (%s, %s, %s)', rows)
+
+    def remove(self, model, pks):
+        rowids = [(pk * KIND_SLOTS + KIND_CODES[model],) for pk in pks]
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', rowids)
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE}')
+
+
+class PostgresBackend:
+    def filter(self, queryset, query):
+        words = tokens(query)
+        if not words:
+            return queryset
+        tsquery = ' & '.join(words) + ':*'
+        ids = RawSQL(
+            f"SELECT obj_id FROM {TABLE} WHERE kind = %s AND document @@ to_tsquery('simple', %s)",
+            [KIND_CODES[queryset.model], tsquery],
+        )
+        return queryset.filter(pk__in=ids)
+
+    def index(self, instances):
+        rows = []
+        for obj in instances:
+            title, body = document(obj)
+            rows.append((KIND_CODES[type(obj)], obj.pk, title, body))
+        if rows:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {TABLE} (kind, obj_id, document) VALUES (%s, %s, "
+                    f"setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')) "
+                    f"ON CONFLICT (kind, obj_id) DO UPDATE SET document = EXCLUDED.document",
+                    rows,
+                )
+
+    def remove(self, model, pks):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {TABLE} WHERE kind = %s AND obj_id = ANY(%s)',
+                [KIND_CODES[model], list(pks)],
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {TABLE}')
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'postgresql': PostgresBackend,
+}
+
+
+def get_backend():
+    return BACKENDS.get(connection.vendor, LikeBackend)()
+
+
+def filter_queryset(queryset, query):
+    return get_backend().filter(queryset, query)
+
+
+def index_instances(instances):
+    get_backend().index(instances)
+
+
+def remove_instances(model, pks):
+    get_backend().remove(model, pks)
+
+
+def rebuild(batch_size=500):
+    backend = get_backend()
+    backend.clear()
+    total = 0
+    for model in KIND_CODES:
+        batch = []
+        for obj in model.objects.iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                backend.index(batch)
+                total += len(batch)
+                batch = []
+        backend.index(batch)
+        total += len(batch)
+    return total
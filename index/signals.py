@@ -0,0 +1,89 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import invalidate_tags
+
+from . import counters, detail_cache, home_sections, images, search
+from .models import Article, Author, Category, Course, Tag, Testimonial
+
+
+@receiver([post_save, post_delete], sender=Article)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Author)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver(m2m_changed, sender=Article.tags.through)
+def invalidate_article_detail(sender, **kwargs):
+    # نام دسته، نویسنده و نوار مقالات مرتبط در صفحات دیگر هم دیده می‌شوند؛
+    # بعد از commit تا رندر هم‌زمان HTML قبل از commit را با نسخه جدید ذخیره نکند
+    transaction.on_commit(detail_cache.invalidate)
+
+
+@receiver([post_save, post_delete], sender=Article)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Testimonial)
+def invalidate_home_sections(sender, **kwargs):
+    # بعد از commit، تا بخشی که هم‌زمان ساخته می‌شود داده قبلی را با نسخه جدید ذخیره نکند
+    names = home_sections.sections_for(sender)
+    transaction.on_commit(lambda: home_sections.invalidate(*names))
+
+
+# تگ‌های کش ویوها (core.cache.cache_view) برای هر مدل
+VIEW_CACHE_TAGS = {
+    Article: 'index:articles',
+    Course: 'index:courses',
+    Category: 'index:categories',
+    Tag: 'index:tags',
+    Article.tags.through: 'index:tags',
+}
+
+
+@receiver([post_save, post_delete], sender=Article)
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver(m2m_changed, sender=Article.tags.through)
+def invalidate_view_caches(sender, **kwargs):
+    tag = VIEW_CACHE_TAGS[sender]
+    transaction.on_commit(lambda: invalidate_tags(tag))
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Course)
+def index_for_search(sender, instance, **kwargs):
+    search.index_instances([instance])
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Course)
+def remove_from_search(sender, instance, **kwargs):
+    search.remove_instances(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Testimonial)
+def build_image_derivatives(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for field in images.IMAGE_FIELDS[sender]:
+        field_file = getattr(instance, field)
+        # تصویری که نسخه‌هایش قبلاً ساخته شده دوباره پردازش نمی‌شود
+        if field_file and not any(images.manifest(field_file).values()):
+            images.schedule(field_file)
+
+
+@receiver(post_save, sender='accounts.ExamResult')
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Author)
+def count_created(sender, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.increment(counters.NAMES_BY_LABEL[sender._meta.label])
+
+
+@receiver(post_delete, sender='accounts.ExamResult')
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Author)
+def count_deleted(sender, **kwargs):
+    counters.increment(counters.NAMES_BY_LABEL[sender._meta.label], -1)
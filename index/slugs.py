@@ -0,0 +1,110 @@
+"""
+تخصیص اسلاگ یکتا برای Article، Course و Tag.
+
+بالاترین پسوند عددی موجود برای یک اسلاگ پایه با یک کوئری تجمیعی پیدا می‌شود
+(به‌جای حلقه exists() روی -1، -2، ...). در صورت برخورد نویسنده‌های هم‌زمان،
+IntegrityError گرفته شده و تخصیص دوباره انجام می‌شود.
+"""
+import re
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, IntegerField, Max, Q, Value, When
+from django.db.models.functions import Cast, Substr
+from django.utils.text import slugify
+
+
+MAX_ATTEMPTS = 5
+
+
+def _siblings(model, base, exclude_pk=None):
+    """اسلاگ پایه و همه نسخه‌های base-N آن."""
+    # بازه [base-, base.) روی ایندکس یکتای slug جستجو می‌شود ('.' کاراکتر بعد از '-' است)
+    qs = model.objects.filter(
+        Q(slug=base)
+        | Q(slug__gte=f'{base}-', slug__lt=f'{base}.', slug__regex=rf'^{re.escape(base)}-[0-9]+$')
+    )
+    if exclude_pk is not None:
+        qs = qs.exclude(pk=exclude_pk)
+    return qs
+
+
+def highest_suffix(model, base, exclude_pk=None):
+    """
+    بالاترین پسوند استفاده‌شده برای base: None اگر آزاد است، 0 اگر فقط خود base
+    گرفته شده، و N برای base-N.
+    """
+    suffix = Case(
+        When(slug=base, then=Value(0)),
+        default=Cast(Substr('slug', len(base) + 2), IntegerField()),
+        output_field=IntegerField(),
+    )
+    return _siblings(model, base, exclude_pk).aggregate(top=Max(suffix))['top']
+
+
+def _base(model, source):
+    # متنی که فقط علامت دارد اسلاگ خالی می‌دهد؛ نام مدل جایگزین می‌شود (tag، tag-1، ...)
+    return slugify(source, allow_unicode=True) or model._meta.model_name
+
+
+def _with_suffix(base, num):
+    return base if num == 0 else f"{base}-{num}"
+
+
+def next_free_slug(model, base, exclude_pk=None):
+    top = highest_suffix(model, base, exclude_pk)
+    return base if top is None else _with_suffix(base, top + 1)
+
+
+def save_with_unique_slug(instance, source, save, *args, **kwargs):
+    """
+    instance را با save ذخیره می‌کند و اگر اسلاگ خالی باشد، یک اسلاگ یکتا از
+    source می‌سازد. برخورد هم‌زمان روی ایندکس یکتای slug با تلاش مجدد حل می‌شود.
+    """
+    if instance.slug:
+        return save(*args, **kwargs)
+
+    model = type(instance)
+    base = _base(model, source)
+    for attempt in range(MAX_ATTEMPTS):
+        instance.slug = next_free_slug(model, base, instance.pk)
+        try:
+            with transaction.atomic():
+                return save(*args, **kwargs)
+        except IntegrityError:
+            taken = model.objects.filter(slug=instance.slug).exclude(pk=instance.pk).exists()
+            if not taken or attempt == MAX_ATTEMPTS - 1:
+                instance.slug = ''
+                raise
+
+
+def assign_bulk(instances, source_attr='title', reserved=()):
+    """
+    اسلاگ یکتا برای فهرستی از نمونه‌های ذخیره‌نشده (مسیر bulk_create).
+    آزاد بودن پایه‌ها با یک کوئری بررسی می‌شود و فقط برای پایه‌های گرفته‌شده، رزروشده یا
+    تکراری در همان دسته، بالاترین پسوند پرسیده می‌شود. reserved اسلاگ‌هایی است که در
+    همان دسته به‌صورت صریح استفاده شده‌اند.
+    """
+    reserved = set(reserved)
+    pending = defaultdict(list)
+    for obj in instances:
+        if not obj.slug:
+            pending[_base(type(obj), getattr(obj, source_attr))].append(obj)
+
+    if not pending:
+        return instances
+    model = type(next(iter(pending.values()))[0])
+    # پایه‌هایی که هنوز آزادند با یک کوئری مشخص می‌شوند؛ فقط برای بقیه بالاترین پسوند پرسیده می‌شود
+    taken = set(model.objects.filter(slug__in=list(pending)).values_list('slug', flat=True))
+
+    for base, objs in pending.items():
+        # اگر پایه (در دیتابیس یا reserved) گرفته باشد، نسخه‌های base-N موجود هم باید رد شوند
+        needs_suffix = base in taken or base in reserved or len(objs) > 1
+        top = highest_suffix(model, base) if needs_suffix else None
+        num = 0 if top is None else top + 1
+        for obj in objs:
+            while _with_suffix(base, num) in reserved:
+                num += 1
+            obj.slug = _with_suffix(base, num)
+            num += 1
+    return instances
@@ -0,0 +1,73 @@
+from django.db.models import Count
+from django.utils.text import slugify
+
+from . import slugs
+from .models import Article, Tag
+
+
+RELATED_LIMIT = 3
+
+
+def parse(value):
+    """
+    نام‌های نرمال‌شده و یکتا از رشته برچسب‌های جداشده با کاما (به ترتیب ورود).
+    برچسب‌هایی که فقط علامت دارند (اسلاگ خالی) کنار گذاشته می‌شوند.
+    """
+    if isinstance(value, (list, tuple)):
+        value = ','.join(value)
+    names = []
+    for raw in (value or '').split(','):
+        name = Tag.normalize(raw)
+        if name and name not in names and slugify(name, allow_unicode=True):
+            names.append(name)
+    return names
+
+
+def resolve(names, cache=None):
+    """
+    نگاشت نام → شناسه برای names؛ برچسب‌های جدید با یک bulk_create ساخته می‌شوند.
+    cache (دیکشنری اختیاری) بین فراخوانی‌ها نگه داشته می‌شود تا کوئری تکرار نشود.
+    """
+    cache = {} if cache is None else cache
+    missing = [name for name in names if name not in cache]
+    if missing:
+        cache.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+        new = [Tag(name=name) for name in missing if name not in cache]
+        if new:
+            slugs.assign_bulk(new, source_attr='name')
+            Tag.objects.bulk_create(new, ignore_conflicts=True)
+            cache.update(Tag.objects.filter(name__in=[t.name for t in new]).values_list('name', 'id'))
+    return {name: cache[name] for name in names}
+
+
+def set_tags(article, value):
+    article.tags.set(resolve(parse(value)).values())
+
+
+def link_bulk(pairs, cache=None):
+    """pairs: [(article_id, 'csv tags'), ...] — همه پیوندها با یک bulk_create."""
+    parsed = [(article_id, parse(value)) for article_id, value in pairs]
+    ids = resolve(list({name for _, names in parsed for name in names}), cache)
+    Through = Article.tags.through
+    Through.objects.bulk_create(
+        [Through(article_id=article_id, tag_id=ids[name]) for article_id, names in parsed for name in names],
+        ignore_conflicts=True,
+    )
+
+
+def related_articles(article, limit=RELATED_LIMIT):
+    """
+    مقالات مرتبط به ترتیب تعداد برچسب مشترک (یک کوئری روی جدول واسط)؛
+    در صورت کمبود، با جدیدترین مقالات همان دسته تکمیل می‌شود.
+    """
+    base = Article.objects.select_related('category').defer('content').exclude(pk=article.pk)
+    related = list(
+        base.filter(tags__in=article.tags.all())
+        .annotate(shared=Count('tags'))
+        .order_by('-shared', '-created_at')[:limit]
+    )
+    if len(related) < limit and article.category_id:
+        related += base.filter(category_id=article.category_id).exclude(
+            pk__in=[a.pk for a in related]
+        ).order_by('-created_at')[:limit - len(related)]
+    return related
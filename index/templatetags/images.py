@@ -0,0 +1,35 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from index import images
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(field_file, alt='', sizes='100vw', css_class='', loading='lazy'):
+    """
+    <picture> با منابع AVIF/WebP در چند عرض و تصویر اصلی به‌عنوان fallback.
+    مثال: {% picture article.featured_image article.title sizes="(max-width: 768px) 100vw, 33vw" %}
+    """
+    if not field_file:
+        return ''
+    sources = [
+        (images.MIME_TYPES[fmt], srcset, sizes)
+        for fmt in images.FORMATS
+        if (srcset := images.srcset(field_file, fmt))
+    ]
+    return format_html(
+        '<picture>{}<img src="{}" alt="{}" class="{}" loading="{}" decoding="async"></picture>',
+        format_html_join('', '<source type="{}" srcset="{}" sizes="{}">', sources),
+        field_file.url,
+        alt,
+        css_class,
+        loading,
+    )
+
+
+@register.simple_tag
+def srcset(field_file, fmt='webp'):
+    return images.srcset(field_file, fmt) if field_file else ''
@@ -1,3 +1,271 @@
+import datetime
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.cache import invalidate_tags, memoize
+from core.singleton import SINGLETON_PK
+
+from . import catalog, contact_intake, counters, slugs, tags
+from .models import AboutContent, Article, Author, Category, ContactMessage, Course, Tag
+
+
+# سقف کوئری هر صفحه فهرست ادمین، مستقل از تعداد ردیف‌ها
+MAX_CHANGELIST_QUERIES = 12
+
+
+class AdminChangelistQueryTests(TestCase):
+    """صفحات فهرست ادمین نباید به ازای هر ردیف کوئری اضافه بزنند (N+1)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.author = Author.objects.create(name="نویسنده", bio="-", avatar='authors/avatar.jpg')
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def create_rows(self, count):
+        start = Category.objects.count()
+        for i in range(start, start + count):
+            category = Category.objects.create(name=f"دسته {i}")
+            article = Article.objects.create(
+                title=f"مقاله {i}", category=category, author=self.author,
+                content="<p>متن</p>", featured_image='articles/image.jpg',
+            )
+            article.tags.add(Tag.objects.create(name=f"برچسب {i}"))
+            Course.objects.create(
+                title=f"دوره {i}", category=category, description="<p>توضیحات</p>", image='courses/image.jpg',
+                start_date=datetime.date(2025, 1, 1), duration="۳ ماه", features="ویژگی",
+            )
+
+    def changelist_queries(self, model):
+        url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_changelists_have_bounded_queries(self):
+        models = [model for model in admin.site._registry if model._meta.app_label == 'index']
+        self.create_rows(2)
+        small = {model: self.changelist_queries(model) for model in models}
+        self.create_rows(20)
+        for model in models:
+            with self.subTest(model=model.__name__):
+                queries = self.changelist_queries(model)
+                self.assertLessEqual(queries, MAX_CHANGELIST_QUERIES)
+                self.assertEqual(queries, small[model], "تعداد کوئری با تعداد ردیف‌ها افزایش یافته است")
+
+
+class AssignBulkSlugTests(TestCase):
+    def article(self, title, slug=''):
+        return Article(title=title, slug=slug, content="<p>متن</p>", featured_image='articles/image.jpg')
+
+    def test_reserved_base_skips_existing_suffixes(self):
+        self.article("foo", slug='foo-1').save()
+        obj = self.article("foo")
+        slugs.assign_bulk([obj], reserved={'foo'})
+        self.assertEqual(obj.slug, 'foo-2')
+
+    def test_free_bases_are_checked_with_one_query(self):
+        objs = [self.article(title) for title in ("alpha", "beta", "gamma")]
+        with self.assertNumQueries(1):
+            slugs.assign_bulk(objs)
+        self.assertEqual([obj.slug for obj in objs], ['alpha', 'beta', 'gamma'])
+
+
+class CatalogCursorTests(TestCase):
+    @unittest.skipUnless(connection.vendor == 'sqlite', "متن EXPLAIN مخصوص SQLite است")
+    def test_sorts_read_from_index(self):
+        # هر مرتب‌سازی keyset باید از ایندکس (فیلد، id) بخواند، نه مرتب‌سازی کامل جدول
+        indexes = {
+            (Article, 'created_at'): 'article_created_idx',
+            (Article, 'views'): 'article_views_idx',
+            (Article, 'reading_time'): 'article_reading_time_idx',
+            (Course, 'start_date'): 'course_start_date_idx',
+            (Course, 'views'): 'course_views_idx',
+        }
+        querysets = {Article: catalog.article_queryset(), Course: catalog.course_queryset()}
+        for (model, field), index in indexes.items():
+            with self.subTest(field=field, model=model.__name__):
+                plan = querysets[model].order_by(f'-{field}', '-id')[:catalog.PAGE_SIZE].explain()
+                self.assertIn(index, plan)
+
+    def test_unparseable_cursor_value(self):
+        cursor = catalog.encode_cursor("not-a-date", 1)
+        response = self.client.get(reverse('catalog_api'), {'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+
+        tag = Tag.objects.create(name="tag")
+        response = self.client.get(reverse('tag_view', args=[tag.slug]), {'cursor': cursor})
+        self.assertEqual(response.status_code, 200)
+
+
+class TagSlugTests(TestCase):
+    def test_punctuation_only_names(self):
+        self.assertEqual(tags.parse("!!!, پایتون, ?"), ["پایتون"])
+        first, second = Tag.objects.create(name="!!!"), Tag.objects.create(name="???")
+        self.assertEqual((first.slug, second.slug), ('tag', 'tag-1'))
+        self.assertTrue(second.get_absolute_url())
+
+
+class TwoTierCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_reads_are_served_from_l1_and_writes_go_through(self):
+        cache.set('key', 1)
+        self.assertEqual(caches['shared'].get('key'), 1)
+        # تغییر مستقیم L2 (پروسه دیگر) تا انقضای L1 دیده نمی‌شود
+        caches['shared'].set('key', 2)
+        self.assertEqual(cache.get('key'), 1)
+        self.assertEqual(cache.incr('key'), 3)
+        self.assertEqual(cache.get('key'), 3)
+        cache.delete('key')
+        self.assertIsNone(cache.get('key'))
+        self.assertIsNone(caches['shared'].get('key'))
+
+    def test_memoize_recomputes_after_tag_invalidation(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(memoize('answer', compute, tags=('test:tag',)), 1)
+        self.assertEqual(memoize('answer', compute, tags=('test:tag',)), 1)
+        invalidate_tags('test:tag')
+        self.assertEqual(memoize('answer', compute, tags=('test:tag',)), 2)
+
+    def test_cache_view_serves_cached_response_until_models_change(self):
+        url = reverse('catalog_api')
+        self.assertEqual(self.client.get(url).json()['count'], 0)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url).json()['count'], 0)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(title="مقاله", content="<p>متن</p>")
+        self.assertEqual(self.client.get(url).json()['count'], 1)
+
+
+class SingletonModelTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        AboutContent.objects.invalidate()
+
+    def test_load_is_cached_and_refreshed_after_save(self):
+        self.assertEqual(AboutContent.load().pk, SINGLETON_PK)
+        with self.captureOnCommitCallbacks(execute=True):
+            AboutContent(title="اول", text="<p>متن</p>").save()
+        self.assertEqual(AboutContent.load().title, "اول")
+        with self.assertNumQueries(0):
+            self.assertEqual(AboutContent.load().title, "اول")
+
+        # نمونه جدید همان تنها ردیف را جایگزین می‌کند
+        with self.captureOnCommitCallbacks(execute=True):
+            AboutContent(title="دوم", text="<p>متن</p>").save()
+        self.assertEqual(AboutContent.objects.count(), 1)
+        self.assertEqual(AboutContent.load().title, "دوم")
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def course(self, title):
+        return Course(
+            title=title, description="<p>توضیحات</p>", start_date=datetime.date(2025, 1, 1),
+            duration="۳ ماه", features="ویژگی",
+        )
+
+    def test_signals_increment_and_reconcile_fixes_bulk_drift(self):
+        for i in range(3):
+            self.course(f"دوره {i}").save()
+        Course.objects.first().delete()
+        self.assertEqual(counters.values()['courses'], 2)
+
+        # bulk_create سیگنال نمی‌فرستد؛ reconcile شمارنده را با COUNT(*) تطبیق می‌دهد
+        Course.objects.bulk_create(slugs.assign_bulk([self.course("انبوه 1"), self.course("انبوه 2")]))
+        self.assertEqual(counters.reconcile(['courses']), {'courses': (2, 4)})
+        self.assertEqual(counters.values()['courses'], 4)
+
+    def test_import_content_reconciles_counters(self):
+        self.assertEqual(counters.values()['courses'], 0)
+        records = [
+            {'type': 'author', 'name': "نویسنده"},
+            {'type': 'course', 'title': "دوره وارداتی", 'start_date': '2025-01-01'},
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'content.jsonl'
+            path.write_text('\n'.join(json.dumps(r) for r in records), encoding='utf-8')
+            call_command('import_content', str(path), stdout=io.StringIO())
+        self.assertEqual(counters.values()['courses'], 1)
+        self.assertEqual(counters.values()['teachers'], 1)
+
+
+class ImportContentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def import_records(self, records):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'content.jsonl'
+            path.write_text('\n'.join(json.dumps(r) for r in records), encoding='utf-8')
+            call_command('import_content', str(path), stdout=io.StringIO())
+
+    def test_existing_and_repeated_authors_are_not_duplicated(self):
+        Author.objects.create(name="موجود")
+        self.import_records([
+            {'type': 'author', 'name': "موجود"},
+            {'type': 'author', 'name': "جدید"},
+            {'type': 'author', 'name': "جدید"},
+        ])
+        self.assertEqual(sorted(Author.objects.values_list('name', flat=True)), ["جدید", "موجود"])
+
+    def test_view_caches_are_invalidated(self):
+        def cached():
+            return memoize('test:import', Course.objects.count, tags=['index:courses'])
+
+        self.assertEqual(cached(), 0)
+        self.import_records([{'type': 'course', 'title': "دوره وارداتی", 'start_date': '2025-01-01'}])
+        self.assertEqual(cached(), 1)
+
+
+# صف در همین ترد با flush تخلیه می‌شود، نه با ترد پس‌زمینه
+@mock.patch.object(contact_intake, '_ensure_worker')
+class ContactIntakeTests(TestCase):
+    data = {'name': "علی", 'phone': '', 'email': 'ali@example.com', 'subject': "سوال", 'message': "سلام"}
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user('staff', 'staff@example.com', 'password', is_staff=True)
+
+    def test_submission_is_saved_and_staff_notified(self, ensure_worker):
+        response = self.client.post(reverse('about_view'), self.data)
+        self.assertRedirects(response, reverse('about_view') + '#contact', fetch_redirect_response=False)
+        contact_intake.flush()
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['staff@example.com'])
 
-# Create your tests here.
+    def test_invalid_submissions_do_not_spend_the_quota(self, ensure_worker):
+        for _ in range(contact_intake.THROTTLE_LIMIT + 2):
+            self.client.post(reverse('about_view'), {**self.data, 'email': 'bad'})
+        self.client.post(reverse('about_view'), self.data)
+        contact_intake.flush()
+        self.assertEqual(ContactMessage.objects.count(), 1)
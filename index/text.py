@@ -0,0 +1,33 @@
+import html
+import math
+import re
+
+from django.utils.html import strip_tags
+
+
+EXCERPT_LENGTH = 150
+WORDS_PER_MINUTE = 200
+
+_whitespace = re.compile(r'\s+')
+_block_end = re.compile(r'(<br\s*/?>|</(?:p|div|li|h[1-6]|td|th|tr|blockquote)>)', re.IGNORECASE)
+
+
+def plain_text(value):
+    """متن خالص از HTML خروجی Summernote (بدون تگ و موجودیت‌ها)."""
+    # پایان بلوک‌ها فاصله می‌گیرد تا کلمات دو پاراگراف به هم نچسبند
+    value = _block_end.sub(r'\1 ', value or '')
+    return _whitespace.sub(' ', html.unescape(strip_tags(value))).strip()
+
+
+def make_excerpt(value, length=EXCERPT_LENGTH):
+    plain = plain_text(value)
+    if len(plain) <= length:
+        return plain
+    # برش روی مرز کلمه تا کلمه نیمه نماند
+    cut = plain[:length].rsplit(' ', 1)[0]
+    return cut + '...'
+
+
+def reading_time(value):
+    words = len(plain_text(value).split())
+    return max(1, math.ceil(words / WORDS_PER_MINUTE))
@@ -4,6 +4,8 @@ from . import views
 urlpatterns = [
     path('', views.home_view, name='home_view'),
     path('list/', views.list_view, name='list_view'),
+    path('api/catalog/', views.catalog_api, name='catalog_api'),
     path('about/', views.about_view, name='about_view'),
     path('tips/<slug:slug>/', views.article_detail, name='article_detail'),
+    path('tags/<str:slug>/', views.tag_view, name='tag_view'),
 ]
\ No newline at end of file
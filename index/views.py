@@ -1,99 +1,119 @@
 import json
 from django.core.serializers.json import DjangoJSONEncoder
-from django.shortcuts import render, get_object_or_404
-from django.http import HttpRequest
+from django.shortcuts import redirect, render, get_object_or_404
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.contrib import messages
-from .models import Article, Course, Category, Announcement, Testimonial, ContactMessage, AboutStat, AboutContent
+from django.db import DatabaseError
+from django.urls import reverse
+from core.cache import cache_view
+from . import catalog, contact_intake, counters, detail_cache, home_sections, tags
+from .forms import ContactForm
+from .models import Article, Category, Tag, AboutStat, AboutContent
 
 
 def article_detail(request: HttpRequest, slug):
-    article = get_object_or_404(Article, slug=slug)
-    article.increase_views()
-    related_articles = Article.objects.filter(category=article.category).exclude(id=article.id)[:3]
-    return render(request, 'index/detail.html', {
-        'article': article,
-        'related_articles': related_articles,
-    })
+    article_ref = get_object_or_404(Article.objects.only('id', 'slug', 'updated_at', 'views'), slug=slug)
+    article_ref.increase_views()
+
+    def build_context():
+        article = Article.objects.select_related('category', 'author').prefetch_related('tags').get(pk=article_ref.pk)
+        return {
+            'article': article,
+            'related_articles': tags.related_articles(article),
+        }
 
+    return HttpResponse(detail_cache.get_or_render(article_ref, build_context))
 
+
+@cache_view(timeout=60 * 10, tags=('index:categories',))
 def list_view(request: HttpRequest):
-    articles = []
-    for a in Article.objects.all():
-        articles.append({
-            'title': a.title,
-            'slug': a.slug,
-            'excerpt': a.content[:150] + '...' if len(a.content) > 150 else a.content,
-            'featured_image': request.build_absolute_uri(a.featured_image.url) if a.featured_image else '',
-            'created_at': a.created_at.isoformat(),
-            'reading_time': a.reading_time,
-            'views': a.views,
-            'category_name': a.category.name if a.category else 'نامشخص',
-            'category_slug': a.category.slug if a.category else 'other',
-        })
-
-    courses = []
-    for c in Course.objects.all():
-        courses.append({
-            'title': c.title,
-            'slug': c.slug,
-            'description': c.description,
-            'image': request.build_absolute_uri(c.image.url) if c.image else '',
-            'start_date': c.start_date.isoformat(),
-            'duration': c.duration,
-            'features': c.features,
-            'views': c.views,
-            'category_name': c.category.name if c.category else 'نامشخص',
-            'category_slug': c.category.slug if c.category else 'other',
-        })
-
-    categories = [{'name': c.name, 'slug': c.slug} for c in Category.objects.all()]
-
-    context = {
-        'articles_data': json.dumps(articles, cls=DjangoJSONEncoder, ensure_ascii=False),
-        'courses_data': json.dumps(courses, cls=DjangoJSONEncoder, ensure_ascii=False),
+    categories = [{'name': c.name, 'slug': c.slug} for c in Category.objects.only('name', 'slug')]
+    return render(request, 'index/list.html', {
         'categories_data': json.dumps(categories, cls=DjangoJSONEncoder, ensure_ascii=False),
+    })
+
+
+# تعداد بازدیدها با سیگنال باطل نمی‌شود؛ مدت کوتاه تأخیر نمایش آن را محدود می‌کند
+@cache_view(timeout=60, tags=('index:articles', 'index:courses', 'index:categories', 'index:tags'))
+def catalog_api(request: HttpRequest):
+    """API صفحه‌بندی‌شده لیست ترفندها و دوره‌ها (فیلتر و مرتب‌سازی در دیتابیس)."""
+    kind = request.GET.get('type', 'tips')
+    category = request.GET.get('category')
+    search = request.GET.get('q', '').strip()
+    sort = request.GET.get('sort', 'newest')
+    cursor = request.GET.get('cursor')
+    try:
+        limit = min(max(int(request.GET.get('limit', catalog.PAGE_SIZE)), 1), catalog.MAX_PAGE_SIZE)
+    except ValueError:
+        limit = catalog.PAGE_SIZE
+
+    if kind == 'courses':
+        queryset = catalog.course_queryset(category, search)
+        field, descending = catalog.COURSE_SORTS.get(sort, catalog.COURSE_SORTS['newest'])
+        serialize = catalog.serialize_course
+    else:
+        queryset = catalog.article_queryset(category, search, request.GET.get('tag'))
+        field, descending = catalog.ARTICLE_SORTS.get(sort, catalog.ARTICLE_SORTS['newest'])
+        serialize = catalog.serialize_article
+
+    try:
+        items, next_cursor = catalog.paginate(queryset, field, descending, cursor, limit)
+    except catalog.InvalidCursor:
+        return JsonResponse({'error': "مکان‌نمای صفحه‌بندی نامعتبر است."}, status=400)
+    data = {
+        'results': [serialize(request, obj) for obj in items],
+        'next_cursor': next_cursor,
     }
-    return render(request, 'index/list.html', context)
+    # شمارش فقط برای صفحه اول؛ صفحات بعدی هزینه ثابت دارند
+    if not cursor:
+        data['count'] = queryset.count()
+    return JsonResponse(data, json_dumps_params={'ensure_ascii': False})
 
 
-def home_view(request: HttpRequest):
-    latest_articles = Article.objects.order_by('-created_at')[:4]
-    announcements = Announcement.objects.filter(is_active=True).order_by('-start_date')[:3]
-    testimonials = Testimonial.objects.order_by('-date')[:3]
-    categories = Category.objects.all()
+@cache_view(timeout=60 * 5, tags=('index:articles', 'index:tags', 'index:categories'))
+def tag_view(request: HttpRequest, slug):
+    tag = get_object_or_404(Tag, slug=slug)
+    queryset = catalog.article_queryset(tag=tag.slug)
+    try:
+        articles, next_cursor = catalog.paginate(queryset, 'created_at', True, request.GET.get('cursor'))
+    except catalog.InvalidCursor:
+        # لینک خراب به صفحه اول برمی‌گردد
+        articles, next_cursor = catalog.paginate(queryset, 'created_at', True)
+    return render(request, 'index/tag.html', {
+        'tag': tag,
+        'articles': articles,
+        'next_cursor': next_cursor,
+    })
 
+
+def home_view(request: HttpRequest):
     return render(request, 'index/index.html', {
-        'latest_articles': latest_articles,
-        'announcements': announcements,
-        'testimonials': testimonials,
-        'categories': categories,
+        'sections': home_sections.render_sections(),
     })
 
 
 def about_view(request: HttpRequest):
-    about_content = AboutContent.objects.first()  # فرض بر این که فقط یک رکورد وجود دارد
-    stats = AboutStat.objects.first()  # فرض بر این که فقط یک رکورد وجود دارد
-
     if request.method == 'POST':
-        name = request.POST.get('name')
-        phone = request.POST.get('phone')
-        email = request.POST.get('email')
-        subject = request.POST.get('subject')
-        message = request.POST.get('message')
-
-        if name and email and subject and message:
-            ContactMessage.objects.create(
-                name=name,
-                phone=phone,
-                email=email,
-                subject=subject,
-                message=message
-            )
-            messages.success(request, 'پیام شما با موفقیت ارسال شد. همکاران ما در اسرع وقت با شما تماس خواهند گرفت.')
-        else:
+        # Post/Redirect/Get: پیام فقط در صف قرار می‌گیرد و صفحه با GET دوباره بارگذاری می‌شود
+        form = ContactForm(request.POST)
+        # فرم نامعتبر از سهمیه ارسال IP کم نمی‌کند
+        if not form.is_valid():
             messages.error(request, 'لطفاً تمام فیلدهای الزامی را پر کنید.')
+        elif not contact_intake.allow(request.META.get('REMOTE_ADDR', '')):
+            messages.error(request, 'تعداد پیام‌های ارسالی از شما زیاد است. لطفاً چند دقیقه دیگر دوباره تلاش کنید.')
+        else:
+            try:
+                contact_intake.submit(form.cleaned_data)
+            except DatabaseError:
+                # صف پر بود و ذخیره همزمان هم ناموفق شد
+                messages.error(request, 'ارسال پیام در حال حاضر ممکن نیست. لطفاً کمی بعد دوباره تلاش کنید.')
+            else:
+                messages.success(request, 'پیام شما با موفقیت ارسال شد. همکاران ما در اسرع وقت با شما تماس خواهند گرفت.')
+        return redirect(reverse('about_view') + '#contact')
 
     return render(request, 'index/about.html', {
-        'about_content': about_content,
-        'stats': stats,
-    })
\ No newline at end of file
+        # مدل‌های تک‌ردیفی از حافظه پروسه خوانده می‌شوند (core.singleton)
+        'about_content': AboutContent.load(),
+        'stats': AboutStat.load(),
+        'counts': counters.values(),
+    })